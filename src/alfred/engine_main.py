@@ -0,0 +1,34 @@
+import threading
+
+from alfred.utils.config import load_config, setup_global_logger
+from alfred.task.engine_launcher import (
+    launch_engine,
+    launch_archiver,
+    launch_change_feed,
+)
+
+
+def engine_in():
+    """Run only the task engine, without Slack or the web server.
+
+    On Postgres any number of engine processes can run next to `alfred`, due
+    templates are claimed with FOR UPDATE SKIP LOCKED so each one is scheduled
+    by a single process. On SQLite run a single engine.
+    """
+    config = load_config()
+    logging_config = config.get("logging", {})
+    console_level = logging_config.get("console_level", "INFO").upper()
+    file_level = logging_config.get("file_level", "DEBUG").upper()
+    log_file = config.get("log_file", "alfred.log")
+    setup_global_logger(console_level=console_level, file_level=file_level, log_file_name=log_file)
+
+    launch_change_feed()
+    if not launch_engine(config.get("scheduler", {})):
+        raise SystemExit(1)
+    launch_archiver(config.get("archive", {}))
+    # engine threads are daemons, keep the process alive
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    engine_in()
@@ -1,6 +1,8 @@
-from flask import Flask, make_response
+from flask import Flask, Response, jsonify, make_response, request
 
-from alfred.task.bulletin import Bulletin
+from alfred.task.bulletin import Bulletin, EXPORT_COLUMNS
+from alfred.task.vault import get_vault
+from alfred.utils.export import EXPORT_FORMATS, MIMETYPES, iter_export
 from alfred.utils.format import format_templates, format_todos
 
 flask_app = Flask(__name__)
@@ -25,3 +27,25 @@ def list_templates():
     templates = Bulletin().get_templates()
     template_list = format_templates(templates)
     return make_response(f"*Your Project Templates:* \n{template_list}", 200)
+
+
+# streams the whole table, one batch of rows in memory at a time
+@flask_app.route("/export/<table>", methods=["GET"])
+def export_table(table):
+    fmt = request.args.get("format", "ndjson")
+    if table not in EXPORT_COLUMNS:
+        return make_response(f"Unknown table '{table}'", 404)
+    if fmt not in EXPORT_FORMATS:
+        return make_response(f"Unknown format '{fmt}'", 400)
+    rows = Bulletin().iter_rows(table)
+    return Response(
+        iter_export(rows, fmt, list(EXPORT_COLUMNS[table])),
+        mimetype=MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={table}.{fmt}"},
+    )
+
+
+# connections checked out, overflow and checkout waits of the vault engines
+@flask_app.route("/stats/pool", methods=["GET"])
+def pool_stats():
+    return jsonify(get_vault().pool_stats())
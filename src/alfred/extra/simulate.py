@@ -0,0 +1,226 @@
+"""
+Replay the engine and the patrol over a simulated date range.
+
+Runs against a throwaway SQLite vault with a SimulatedClock and a stub Slack
+client, as fast as the database allows, and reports per simulated day how
+many todos were created, how many messages were posted, how many DB
+statements were executed and how long it took.
+
+    alfred-simulate --start 2025-11-03 --days 7 --templates 500
+"""
+
+import logging
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import typer
+from sqlalchemy import event
+
+from alfred.slack.butler import Butler
+from alfred.task.bulletin import Bulletin, DEFAULT_MAX_LOOKBACK
+from alfred.task.vault import Vault
+from alfred.utils import clock
+
+# what the Slack modal produces for office hours
+SAMPLE_CRONS = [
+    "00 09 * * 1-5",
+    "30 09 * * 1-5",
+    "00 10 * * *",
+    "00 14 * * 1",
+    "30 16 * * 1-5",
+    "30 09 * * FRI#2",
+    "00 11 * * MON#1",
+]
+SAMPLE_OFFSETS = ["30m", "1h", "2h"]
+
+
+class StubSlackClient:
+    """Records posted messages instead of sending them"""
+
+    def __init__(self):
+        self.messages = []
+
+    def chat_postMessage(self, **kwargs):
+        self.messages.append(kwargs)
+        return {"ok": True}
+
+
+def seed_templates(bulletin: Bulletin, count: int, rng: random.Random):
+    for i in range(count):
+        bulletin.add_template(
+            user_id=f"U{i % 50:03d}",
+            content=f"Simulated task {i}",
+            cron=rng.choice(SAMPLE_CRONS),
+            ddl_offset=rng.choice(SAMPLE_OFFSETS),
+            run_once="0",
+        )
+
+
+def run_simulation(
+    start: datetime,
+    days: int = 7,
+    templates: int = 100,
+    engine_interval_seconds: int = 60,
+    patrol_interval_seconds: int = 60,
+    horizon_hours: float = 0,
+    complete_ratio: float = 0.8,
+    seed: int = 0,
+    db_url: str | None = None,
+):
+    """Simulate `days` days from `start`.
+
+    Args:
+        start: Simulated start time, templates are created at this time
+        days: Number of simulated days
+        templates: Number of generated templates
+        engine_interval_seconds: Simulated interval between engine passes
+        patrol_interval_seconds: Simulated interval between patrols
+        horizon_hours: Engine look-ahead horizon, like scheduler.engine_horizon_hours
+        complete_ratio: Share of reminded todos the users complete
+        seed: Random seed of the generated templates and completions
+        db_url: Vault to use, a throwaway SQLite database if not given
+
+    Returns:
+        List of per day dicts with date, todos_created, messages, completed,
+        statements and wall_ms
+    """
+    with tempfile.TemporaryDirectory(prefix="alfred-sim-") as tmp_dir:
+        vault = Vault(db_url or f"sqlite:///{tmp_dir}/vault.db")
+        statements = {"count": 0}
+
+        @event.listens_for(vault.engine, "before_cursor_execute")
+        def count_statement(*_):
+            statements["count"] += 1
+
+        try:
+            with clock.use_clock(clock.SimulatedClock(start)) as sim_clock:
+                return _simulate(
+                    sim_clock,
+                    Butler(Bulletin(vault)),
+                    statements,
+                    days=days,
+                    templates=templates,
+                    engine_interval=timedelta(seconds=engine_interval_seconds),
+                    patrol_interval=timedelta(seconds=patrol_interval_seconds),
+                    horizon=timedelta(hours=horizon_hours),
+                    complete_ratio=complete_ratio,
+                    rng=random.Random(seed),
+                )
+        finally:
+            vault.engine.dispose()
+
+
+def _simulate(
+    sim_clock,
+    butler: Butler,
+    statements,
+    days,
+    templates,
+    engine_interval,
+    patrol_interval,
+    horizon,
+    complete_ratio,
+    rng,
+):
+    bulletin = butler.bulletin
+    client = StubSlackClient()
+    # same window as launch_engine_scheduler
+    lookahead = max(engine_interval, timedelta(minutes=1), horizon)
+    start = sim_clock.now()
+    seed_templates(bulletin, templates, rng)
+
+    report = []
+    answered = set()
+    next_engine = next_patrol = start
+    for day in range(days):
+        day_end = start + timedelta(days=day + 1)
+        stats = {
+            "date": (start + timedelta(days=day)).date(),
+            "todos_created": 0,
+            "messages": 0,
+            "completed": 0,
+        }
+        statements_before = statements["count"]
+        messages_before = len(client.messages)
+        wall_start = time.perf_counter()
+
+        while min(next_engine, next_patrol) < day_end:
+            now = min(next_engine, next_patrol)
+            sim_clock.set(now)
+            if now == next_engine:
+                stats["todos_created"] += bulletin.backfill_todos(
+                    now, DEFAULT_MAX_LOOKBACK
+                )
+                stats["todos_created"] += bulletin.schedule_todos(now, lookahead)
+                next_engine += engine_interval
+            if now == next_patrol:
+                butler.patrol(client, channel="simulation")
+                # users complete some of the todos they were reminded of
+                for todo_id in butler.sent_today("normal") - answered:
+                    answered.add(todo_id)
+                    if rng.random() < complete_ratio:
+                        butler.mark_todo_complete(todo_id)
+                        stats["completed"] += 1
+                next_patrol += patrol_interval
+
+        stats["messages"] = len(client.messages) - messages_before
+        stats["statements"] = statements["count"] - statements_before
+        stats["wall_ms"] = (time.perf_counter() - wall_start) * 1000
+        report.append(stats)
+    return report
+
+
+def format_report(report) -> str:
+    lines = [
+        f"{'date':<12}{'todos':>8}{'messages':>10}{'completed':>11}"
+        f"{'statements':>12}{'wall ms':>10}"
+    ]
+    for stats in report:
+        lines.append(
+            f"{stats['date'].isoformat():<12}{stats['todos_created']:>8}"
+            f"{stats['messages']:>10}{stats['completed']:>11}"
+            f"{stats['statements']:>12}{stats['wall_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def simulate(
+    start: str = typer.Option(
+        None, help="Simulated start, ISO format, defaults to today 00:00"
+    ),
+    days: int = typer.Option(7, help="Number of simulated days"),
+    templates: int = typer.Option(100, help="Number of generated templates"),
+    engine_interval: int = typer.Option(60, help="Engine interval in seconds"),
+    patrol_interval: int = typer.Option(60, help="Patrol interval in seconds"),
+    horizon_hours: float = typer.Option(0, help="Engine look-ahead horizon in hours"),
+    complete_ratio: float = typer.Option(0.8, help="Share of reminded todos completed"),
+    seed: int = typer.Option(0, help="Random seed"),
+    verbose: bool = typer.Option(False, help="Show engine and patrol logs"),
+):
+    """Replay the engine and the patrol over a simulated date range"""
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING)
+    if start is None:
+        start_time = datetime.combine(datetime.now().date(), datetime.min.time())
+    else:
+        start_time = datetime.fromisoformat(start)
+    report = run_simulation(
+        start_time,
+        days=days,
+        templates=templates,
+        engine_interval_seconds=engine_interval,
+        patrol_interval_seconds=patrol_interval,
+        horizon_hours=horizon_hours,
+        complete_ratio=complete_ratio,
+        seed=seed,
+    )
+    typer.echo(format_report(report))
+
+
+def simulate_in():
+    typer.run(simulate)
+
+
+if __name__ == "__main__":
+    simulate_in()
@@ -1,6 +1,10 @@
 from alfred.utils.config import load_config, setup_global_logger
 
-from alfred.task.engine_launcher import launch_engine_scheduler
+from alfred.task.engine_launcher import (
+    launch_engine,
+    launch_archiver,
+    launch_change_feed,
+)
 from alfred.slack.patrol_launcher import launch_patrol_scheduler
 from alfred.slack.app import socket_mode_handler
 from alfred.slack import listeners
@@ -34,9 +38,10 @@ def alfred_in():
     #         "Please check SLACK_BOT_TOKEN and bot permissions (auth:test scope)."
     #     )
     #     sys.exit(1)
-    engine_interval = config.get("scheduler", {}).get("engine_interval_seconds", 60)
     patrol_interval = config.get("scheduler", {}).get("patrol_interval_seconds", 60)
-    launch_engine_scheduler(seconds=engine_interval)
+    launch_change_feed()
+    launch_engine(config.get("scheduler", {}))
+    launch_archiver(config.get("archive", {}))
     launch_patrol_scheduler(seconds=patrol_interval)
 
     socket_mode_handler.connect()  # Keep the Socket Mode client running but non-blocking
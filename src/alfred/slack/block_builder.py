@@ -10,7 +10,7 @@ class BlockStyle(ABC):
         pass
 
     @abstractmethod
-    def build_summary_blocks(self, todos_today):
+    def build_summary_blocks(self, todos_today, todos_tomorrow=None):
         pass
 
 
@@ -124,7 +124,7 @@ class StandardBlockStyle(BlockStyle):
         }
         return [section_block]
 
-    def build_summary_blocks(self, todos_today):
+    def build_summary_blocks(self, todos_today, todos_tomorrow=None):
         blocks = []
         if not todos_today:
             return blocks
@@ -142,6 +142,11 @@ class StandardBlockStyle(BlockStyle):
             "type": "context",
             "elements": [{"type": "mrkdwn", "text": f"总计: {total} 个任务"}]
         })
+        if todos_tomorrow:
+            blocks.append({
+                "type": "context",
+                "elements": [{"type": "mrkdwn", "text": f"明日已排期: {len(todos_tomorrow)} 个任务"}]
+            })
         return blocks
 
 
@@ -247,7 +252,7 @@ class SaaSBlockStyle(BlockStyle):
 
         return [section_block]
 
-    def build_summary_blocks(self, todos_today):
+    def build_summary_blocks(self, todos_today, todos_tomorrow=None):
         blocks = []
         if not todos_today:
             return blocks
@@ -265,6 +270,11 @@ class SaaSBlockStyle(BlockStyle):
             "type": "context",
             "elements": [{"type": "mrkdwn", "text": f"Total todos: {total}"}]
         })
+        if todos_tomorrow:
+            blocks.append({
+                "type": "context",
+                "elements": [{"type": "mrkdwn", "text": f"Scheduled tomorrow: {len(todos_tomorrow)}"}]
+            })
         return blocks
 
 
@@ -374,7 +384,7 @@ class GitFlowBlockStyle(BlockStyle):
 
         return [section_block]
 
-    def build_summary_blocks(self, todos_today):
+    def build_summary_blocks(self, todos_today, todos_tomorrow=None):
         blocks = []
         if not todos_today:
             return blocks
@@ -401,6 +411,18 @@ class GitFlowBlockStyle(BlockStyle):
                 ],
             }
         )
+        if todos_tomorrow:
+            blocks.append(
+                {
+                    "type": "context",
+                    "elements": [
+                        {
+                            "type": "mrkdwn",
+                            "text": f"Next up: {len(todos_tomorrow)} todos scheduled for tomorrow.",
+                        }
+                    ],
+                }
+            )
 
         return blocks
 
@@ -432,5 +454,5 @@ class BlockBuilder:
         return cls._style.build_single_todo_blocks(todo, is_overdue)
 
     @classmethod
-    def build_summary_blocks(cls, todos_today):
-        return cls._style.build_summary_blocks(todos_today)
+    def build_summary_blocks(cls, todos_today, todos_tomorrow=None):
+        return cls._style.build_summary_blocks(todos_today, todos_tomorrow)
@@ -1,9 +1,10 @@
 from contextlib import contextmanager
 import logging
-from datetime import datetime, time
+from datetime import date, time, timedelta
 
 from alfred.slack.block_builder import BlockBuilder
 from alfred.task.bulletin import Bulletin
+from alfred.utils import clock
 
 
 class Butler:
@@ -11,32 +12,59 @@ class Butler:
     Patrol bulletin and manage Slack interactions.
     """
 
-    def __init__(self):
+    def __init__(self, bulletin: Bulletin | None = None):
         self.logger = logging.getLogger(__name__)
-        self.bulletin = Bulletin()
-        self.sent_notifies = {"normal": set(), "overdue": set()}
-        self.sent_summaries = set()
+        self.bulletin = bulletin or Bulletin()
+        # reminders sent for the todos of one day, (todo_id, kind), read from the
+        # notifications_sent ledger when the day changes, so the cache never
+        # outgrows one day and a restart doesn't announce the todos again
+        self._sent_day = None
+        self._sent = set()
+        self._last_summary_day = None
+        self._summary_loaded = False
         self.summary_time = time(hour=18, minute=0)  # 6 PM
 
+    def sent_notifications(self, day: date):
+        """(todo_id, kind) of the reminders sent for the todos of `day`"""
+        if day != self._sent_day:
+            # drops the previous day
+            self._sent = self.bulletin.get_sent_notifications(day)
+            self._sent_day = day
+        return self._sent
+
+    def sent_today(self, kind: str):
+        """ids of today's todos reminded of `kind` ("normal" or "overdue")"""
+        sent = self.sent_notifications(clock.now().date())
+        return {todo_id for todo_id, sent_kind in sent if sent_kind == kind}
+
+    def summary_sent_on(self, day: date) -> bool:
+        if not self._summary_loaded:
+            last = self.bulletin.get_last_summary_time()
+            self._last_summary_day = last.date() if last else None
+            self._summary_loaded = True
+        return self._last_summary_day == day
+
     @contextmanager
     def gather_notify_blocks(self):
         """gather today pending todos as Slack blocks"""
-        current_time = datetime.now()
-        todos_today = self.bulletin.get_todos(current_time.date())
+        current_time = clock.now()
+        # finished todos never need a reminder
+        todos_today = self.bulletin.get_todos(current_time.date(), open_only=True)
+        sent = self.sent_notifications(current_time.date())
 
         # filter pending todos, some todos have already been reminded, skip those
         def need_normal_remind(todo):
             # todo times are datetime
             return (
                 todo["remind_time"] <= current_time < todo["ddl_time"]
-                and todo["todo_id"] not in self.sent_notifies["normal"]
+                and (todo["todo_id"], "normal") not in sent
                 and todo["status"] == "pending"
             )
 
         def need_overdue_remind(todo):
             return (
                 todo["ddl_time"] <= current_time
-                and todo["todo_id"] not in self.sent_notifies["overdue"]
+                and (todo["todo_id"], "overdue") not in sent
                 and todo["status"] == "pending"
             )
 
@@ -55,26 +83,32 @@ class Butler:
                 return
             self.logger.info("[Butler] Successfully sent, update status.")
             # mark reminders as sent
-            for todo in normal_todos:
-                self.sent_notifies["normal"].add(todo["todo_id"])
-            for todo in overdue_todos:
-                self.sent_notifies["overdue"].add(todo["todo_id"])
-            self.logger.debug(f"[Butler] Updated sent_notifies: {self.sent_notifies}")
+            notified = [(todo["todo_id"], "normal") for todo in normal_todos] + [
+                (todo["todo_id"], "overdue") for todo in overdue_todos
+            ]
+            self.bulletin.record_notifications(notified, current_time)
+            sent.update(notified)
+            self.logger.debug(f"[Butler] Recorded sent notifications: {notified}")
 
     @contextmanager
     def gather_end_of_day_summary(self):
         """gather end-of-day summary as Slack blocks"""
-        current_time = datetime.now()
+        current_time = clock.now()
         blocks = []
         try:
-            if (
-                current_time.date() not in self.sent_summaries
-                and current_time.time() >= self.summary_time
+            if current_time.time() >= self.summary_time and not self.summary_sent_on(
+                current_time.date()
             ):
                 self.logger.info("[Butler] Gathering end-of-day summary.")
                 todos_today = self.bulletin.get_todos(current_time.date())
                 if todos_today:
-                    blocks = BlockBuilder.build_summary_blocks(todos_today)
+                    # only scheduled already if the engine runs with a look-ahead horizon
+                    todos_tomorrow = self.bulletin.get_todos(
+                        current_time.date() + timedelta(days=1)
+                    )
+                    blocks = BlockBuilder.build_summary_blocks(
+                        todos_today, todos_tomorrow
+                    )
             yield blocks
         except Exception as e:
             self.logger.exception(f"[Butler] ERROR sending end-of-day summary: {e}")
@@ -84,12 +118,28 @@ class Butler:
                 self.logger.debug("[Butler] No end-of-day summary to send.")
                 return
             self.logger.info("[Butler] Successfully sent end-of-day summary.")
-            self.sent_summaries.add(current_time.date())
-            self.logger.debug(f"[Butler] Updated sent_summaries: {self.sent_summaries}")
-
-    def build_single_todo_blocks(self, todo_id: int):
-        """build blocks for a single todo by id"""
-        todo = self.bulletin.get_todo(todo_id)
+            self.bulletin.record_summary(current_time)
+            self._last_summary_day = current_time.date()
+
+    def patrol(self, client, channel: str):
+        """Post due reminders, and the end-of-day summary once it is time"""
+        with self.gather_notify_blocks() as blocks:
+            if blocks:
+                res = client.chat_postMessage(channel=channel, blocks=blocks, text="Todo Reminder")
+                if not res["ok"]:
+                    raise Exception(f"Slack API error: {res}")
+
+        # if end of day, send summary
+        with self.gather_end_of_day_summary() as blocks:
+            if blocks:
+                res = client.chat_postMessage(channel=channel, blocks=blocks, text="Daily Todo Summary")
+                if not res["ok"]:
+                    raise Exception(f"Slack API error: {res}")
+
+    def build_single_todo_blocks(self, todo_id: int, todo=None):
+        """build blocks for a single todo by id, read unless the todo row is given"""
+        if todo is None:
+            todo = self.bulletin.get_todo(todo_id)
         if not todo:
             raise ValueError(f"Todo with id {todo_id} not found.")
         return BlockBuilder.build_single_todo_blocks(todo)
@@ -108,12 +158,12 @@ class Butler:
         return new_blocks
 
     def mark_todo_complete(self, todo_id: int):
-        """mark a todo as completed"""
-        self.bulletin.complete_todo(todo_id, datetime.now())
+        """mark a todo as completed, returns the completed todo or None"""
+        return self.bulletin.complete_todo(todo_id, clock.now())
 
     def mark_todo_undo(self, todo_id: int):
-        """undo a todo completion"""
-        self.bulletin.revert_todo_completion(todo_id, datetime.now())
+        """undo a todo completion, returns the pending todo or None"""
+        return self.bulletin.revert_todo_completion(todo_id, clock.now())
 
     def __getattr__(self, name):
         """Delegate attribute access to bulletin for convenience"""
@@ -1,8 +1,15 @@
+import json
+import re
 from datetime import datetime
 
 from alfred.slack.app import app
 from alfred.slack.butler import butler
-from alfred.utils.format import build_add_template_view
+from alfred.task.bulletin import decode_cursor
+from alfred.task.vault.models import TodoStatus
+from alfred.utils import clock
+from alfred.utils.config import get_slack_admin
+from alfred.utils.duration import parse_duration
+from alfred.utils.format import build_add_template_view, build_todo_page_blocks
 
 
 @app.action("mark_todo_complete")
@@ -24,9 +31,11 @@ def handle_mark_todo_complete(ack, body, client, logger):
 
     try:
         todo_id = int(todo_id_str)
-        butler.mark_todo_complete(todo_id)
-        # generate from todo id, more clear
-        completed_blocks = butler.build_single_todo_blocks(todo_id)
+        # the replica may not have the new status yet, read it back from the primary
+        with butler.read_your_writes():
+            # None if it was already completed, e.g. by a second click
+            todo = butler.mark_todo_complete(todo_id)
+            completed_blocks = butler.build_single_todo_blocks(todo_id, todo)
         new_blocks = butler.replace_todo_blocks_in_message(
             original_blocks, todo_id, completed_blocks
         )
@@ -38,7 +47,7 @@ def handle_mark_todo_complete(ack, body, client, logger):
         client.chat_postMessage(
             channel=channel_id,
             thread_ts=message_ts,
-            text=f"✅ <@{user_id}> 于 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} 完成了任务。",
+            text=f"✅ <@{user_id}> 于 {clock.now().strftime('%Y-%m-%d %H:%M:%S')} 完成了任务。",
             reply_broadcast=False,  # do not notify channel, just reply in thread
         )
 
@@ -69,8 +78,9 @@ def handle_mark_todo_undo(ack, body, client, logger):
     try:
         todo_id = int(todo_id_str)
 
-        butler.mark_todo_undo(todo_id)
-        pending_blocks = butler.build_single_todo_blocks(todo_id)
+        with butler.read_your_writes():
+            todo = butler.mark_todo_undo(todo_id)
+            pending_blocks = butler.build_single_todo_blocks(todo_id, todo)
         new_blocks = butler.replace_todo_blocks_in_message(
             original_blocks, todo_id, pending_blocks
         )
@@ -82,7 +92,7 @@ def handle_mark_todo_undo(ack, body, client, logger):
         client.chat_postMessage(
             channel=channel_id,
             thread_ts=message_ts,
-            text=f"↩️ <@{user_id}> 于 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} 撤销了任务完成状态。",
+            text=f"↩️ <@{user_id}> 于 {clock.now().strftime('%Y-%m-%d %H:%M:%S')} 撤销了任务完成状态。",
             reply_broadcast=False,
         )
 
@@ -93,6 +103,92 @@ def handle_mark_todo_undo(ack, body, client, logger):
         )
 
 
+# same bound as `/alfred list todos --limit`
+MAX_PAGE_SIZE = 40
+PAGE_QUERY_KEYS = {"limit", "after", "before", "statuses", "user_id", "start", "end"}
+
+
+def parse_page_query(value: str) -> dict:
+    """
+    Filters and cursor of a Prev/Next button value, as get_todos_page kwargs.
+    The value comes back from the client, so only the keys that
+    build_todo_page_blocks writes are accepted, with their types checked.
+
+    Raises:
+        ValueError: if the value is not a valid page query
+    """
+    query = json.loads(value)
+    if not isinstance(query, dict):
+        raise ValueError("Invalid page query")
+    unknown = set(query) - PAGE_QUERY_KEYS
+    if unknown:
+        raise ValueError(f"Unknown page query keys: {', '.join(sorted(unknown))}")
+
+    limit = query.get("limit")
+    if limit is not None and (
+        type(limit) is not int or not 1 <= limit <= MAX_PAGE_SIZE
+    ):
+        raise ValueError(f"Invalid page size: {limit!r}")
+    if "after" in query and "before" in query:
+        raise ValueError("A page query has either an after or a before cursor")
+    for key in ("after", "before"):
+        if key in query:
+            if not isinstance(query[key], str):
+                raise ValueError(f"Invalid page cursor: {query[key]!r}")
+            decode_cursor(query[key])
+    if "statuses" in query:
+        statuses = query["statuses"]
+        if not isinstance(statuses, list) or not all(
+            isinstance(status, str) for status in statuses
+        ):
+            raise ValueError(f"Invalid statuses: {statuses!r}")
+        for status in statuses:
+            TodoStatus(status)
+    if "user_id" in query and not isinstance(query["user_id"], str):
+        raise ValueError(f"Invalid user: {query['user_id']!r}")
+    for key in ("start", "end"):
+        if key in query:
+            if not isinstance(query[key], str):
+                raise ValueError(f"Invalid {key}: {query[key]!r}")
+            datetime.fromisoformat(query[key])
+    return query
+
+
+@app.action(re.compile(r"^list_todos_(prev|next)$"))
+def handle_list_todos_page(ack, body, respond, logger):
+    """
+    Prev/Next buttons of `/alfred list todos`.
+    The button value holds the filters and the cursor, replace the page in place.
+    """
+    ack()
+
+    user_id = body["user"]["id"]
+    # same check as /alfred, the buttons must not list more than the command
+    if (admin_list := get_slack_admin()) and (user_id not in admin_list):
+        respond(
+            replace_original=False,
+            text="❌ *Permission Denied*: You are not an admin.",
+        )
+        logger.warning(f"User {user_id} is not an admin. Permission denied.")
+        return
+
+    try:
+        query = parse_page_query(body["actions"][0]["value"])
+        logger.info(f"User {user_id} turned the todo page: {query}")
+        page = butler.get_todos_page(**query)
+        # the next buttons carry the filters only, plus their own cursor
+        query.pop("after", None)
+        query.pop("before", None)
+        respond(
+            replace_original=True,
+            text="TODOs",
+            blocks=build_todo_page_blocks(page, query),
+        )
+    except Exception as e:
+        logger.exception(f"Failed to turn the todo page: {e}")
+        respond(replace_original=False, text=f"❌ *翻页失败*:\n`{e}`")
+
+
 @app.action("open_add_template_modal")
 def open_add_template_modal(ack, body, client):
     ack()
@@ -201,6 +297,12 @@ def handle_cron_submission(ack, body, view, client, logger):
             # 结果: 30 09 * * FRI#2
             final_cron = f"{minute} {hour} * * {day_val}#{week_val}"
 
+    # 逾期偏移量: 支持 1h30m 这样的组合写法
+    try:
+        parse_duration(offset or "")
+    except ValueError:
+        errors["block_offset"] = "无法解析的偏移量，例如 30m、1h30m、1d"
+
     # --- 3. 错误处理与保存 ---
     if errors:
         ack(response_action="errors", errors=errors)
@@ -1,17 +1,24 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import enum
+import os
+import tempfile
+from typing import List
 from croniter import croniter
-import re
 import typer
 import shlex
 
 from alfred.slack.block_builder import BlockBuilder
+from alfred.task.bulletin import DEFAULT_PAGE_SIZE, EXPORT_COLUMNS
+from alfred.task.vault.models import TodoStatus
+from alfred.utils import clock
 from alfred.utils.config import get_slack_admin
+from alfred.utils.duration import parse_duration
+from alfred.utils.export import write_export
 from alfred.utils.format import (
     build_add_template_view,
+    build_todo_page_blocks,
     format_templates,
     format_todo_logs,
-    format_todos,
 )
 
 from alfred.slack.app import app
@@ -58,6 +65,7 @@ def handle_alfred_command(ack, body, client, logger, say):
                 self.say_ephemeral = say_ephemeral
                 self.say = say
                 self.client = client
+                self.user_id = user_id
                 self.trigger_id = body.get("trigger_id")
 
         alfred_cli_app(
@@ -92,27 +100,35 @@ def validate_cron(value: str) -> str:
     return value
 
 
-# TODO(hw): ref bulletin offset validation
 def validate_duration(value: str) -> str:
     """
-    Validate offset field.
-    Parse '1h', '3m', '5m', '1d' or '1' (represents 1d).
+    Validate offset field, same parser as Bulletin.add_template.
+    Parse '1h', '3m', '1h30m', '1d' or '1' (represents 1d).
     """
     value_str = str(value).strip().lower()
+    try:
+        parse_duration(value_str)
+    except ValueError:
+        raise typer.BadParameter(f"Unable to parse duration/bias format: '{value}'")
+    return value_str
+
 
-    match = re.match(r"^(\d+)([smhd])$", value_str)
-    if match:
-        # Validation passed (e.g., '1h', '3m')
-        # print(f"Validated Duration: {value_str}")
-        return value_str
+def validate_date(value: str | None) -> str | None:
+    """Check if value is a YYYY-MM-DD date"""
+    if value is None:
+        return None
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        raise typer.BadParameter(f"'{value}' is not a YYYY-MM-DD date")
+    return value
 
-    match_int = re.match(r"^(\d+)$", value_str)
-    if match_int:
-        # Validation passed (e.g., '1', assumed as '1d')
-        # print(f"Validated Duration: {value_str} (assumed days)")
-        return value_str
 
-    raise typer.BadParameter(f"Unable to parse duration/bias format: '{value}'")
+def parse_user(value: str | None) -> str | None:
+    """Accept a bare user ID or a Slack mention like <@U0xxx|name>"""
+    if value is None:
+        return None
+    return value.strip("<@>").split("|")[0]
 
 
 class ListCategory(str, enum.Enum):
@@ -120,6 +136,17 @@ class ListCategory(str, enum.Enum):
     templates = "templates"
 
 
+class ExportTable(str, enum.Enum):
+    todo_templates = "todo_templates"
+    todos = "todos"
+    todo_status_logs = "todo_status_logs"
+
+
+class ExportFormat(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
 def help_string():
     return (
         "*Alfred Bot Command Help:*\n"
@@ -130,8 +157,18 @@ def help_string():
         "  (Example: `/alfred add template 'U0xxx' 'Review' '0 9 * * 1-5' '1h' '1'`)\n"
         "• `/alfred list [todos|templates]`\n"
         "  (Default is `todos`)\n"
+        "• `/alfred list todos [--status <status>] [--user <user_id>] [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--limit <n>]`\n"
+        "  (Filter todos, one page at a time with Prev/Next buttons, `--status` can be repeated)\n"
         "• `/alfred log <todo_id>`\n"
         "  (Show log for a specific todo ID)\n"
+        "• `/alfred deactivate <template_id> [<template_id>...]`\n"
+        "  (Stop templates and revoke their open todos)\n"
+        "• `/alfred activate <template_id> [<template_id>...]`\n"
+        "  (Start templates again, missed fire times are not replayed)\n"
+        "• `/alfred revoke overdue <user_id>`\n"
+        "  (Revoke all open todos of a user whose DDL has passed)\n"
+        "• `/alfred export <todo_templates|todos|todo_status_logs> [ndjson|csv]`\n"
+        "  (Send the whole table to you as a file, default format is `ndjson`)\n"
         "• `/alfred test`\n"
         "  (Send a test Block Kit message)\n"
         "• `/alfred help`\n"
@@ -205,6 +242,21 @@ def list_items(
         case_sensitive=False,
         help="Type of items to list (todos or templates)",
     ),
+    status: List[TodoStatus] = typer.Option(
+        None, case_sensitive=False, help="Only todos in this status, repeatable"
+    ),
+    user: str = typer.Option(
+        None, callback=parse_user, help="Only todos of this user"
+    ),
+    from_date: str = typer.Option(
+        None, "--from", callback=validate_date, help="First reminder date, YYYY-MM-DD"
+    ),
+    to_date: str = typer.Option(
+        None, "--to", callback=validate_date, help="Last reminder date, YYYY-MM-DD"
+    ),
+    limit: int = typer.Option(
+        DEFAULT_PAGE_SIZE, min=1, max=40, help="Todos per page"
+    ),
 ):
     """
     List todos or templates.
@@ -214,12 +266,20 @@ def list_items(
     logger.info(f"Category: {category.value}")  # 'todos' or 'templates'
 
     if category == ListCategory.todos:
-        logger.info("Fetching all active todos...")
-        # admin may want to see all todos
-        todos = butler.get_todos()
-        todo_list = format_todos(todos)
-        logger.debug(f"Listing todos: {todo_list}")
-        say_ephemeral(f"*TODOs:*\n{todo_list}")
+        # filters travel with the Prev/Next buttons, so keep them json friendly
+        query = {"limit": limit}
+        if status:
+            query["statuses"] = [s.value for s in status]
+        if user:
+            query["user_id"] = user
+        if from_date:
+            query["start"] = date.fromisoformat(from_date).isoformat()
+        if to_date:
+            # the whole last day is included
+            query["end"] = (date.fromisoformat(to_date) + timedelta(days=1)).isoformat()
+        logger.info(f"Fetching first page of todos: {query}")
+        page = butler.get_todos_page(**query)
+        say_ephemeral("TODOs", blocks=build_todo_page_blocks(page, query))
     elif category == ListCategory.templates:
         logger.info("Fetching all templates...")
         templates = butler.get_templates()
@@ -228,6 +288,71 @@ def list_items(
         say_ephemeral(f"*Task Templates:*\n{template_list}")
 
 
+# --- bulk template commands ---
+@alfred_cli_app.command(
+    "deactivate",
+    help="• /alfred deactivate <template_id> [<template_id>...] (Stop templates, revoke their open todos)",
+)
+def deactivate_templates(
+    ctx: typer.Context,
+    template_ids: List[int] = typer.Argument(..., help="Template IDs to deactivate"),
+):
+    """
+    Deactivate templates and revoke their open todos, in one transaction.
+    """
+    result = butler.set_templates_active_status(template_ids, False, clock.now())
+    ctx.obj.logger.info(f"Deactivated templates: {result}")
+    ctx.obj.say_ephemeral(_templates_changed_message("Deactivated", template_ids, result))
+
+
+@alfred_cli_app.command(
+    "activate",
+    help="• /alfred activate <template_id> [<template_id>...] (Start templates again)",
+)
+def activate_templates(
+    ctx: typer.Context,
+    template_ids: List[int] = typer.Argument(..., help="Template IDs to activate"),
+):
+    """
+    Activate templates again, they fire from now on.
+    """
+    result = butler.set_templates_active_status(template_ids, True, clock.now())
+    ctx.obj.logger.info(f"Activated templates: {result}")
+    ctx.obj.say_ephemeral(_templates_changed_message("Activated", template_ids, result))
+
+
+def _templates_changed_message(action: str, template_ids, result) -> str:
+    changed = result["template_ids"]
+    message = f"✅ {action} templates {', '.join(map(str, changed)) or '-'}"
+    if result["revoked"]:
+        message += f", revoked {result['revoked']} open todos"
+    missing = sorted(set(template_ids) - set(changed))
+    if missing:
+        message += f"\n❌ Not found: {', '.join(map(str, missing))}"
+    return message
+
+
+revoke_app = typer.Typer(help="Revoke todos in bulk (e.g., 'overdue')")
+alfred_cli_app.add_typer(revoke_app, name="revoke")
+
+
+@revoke_app.command(
+    "overdue", help="• /alfred revoke overdue <user_id> (Revoke a user's overdue todos)"
+)
+def revoke_overdue(
+    ctx: typer.Context,
+    user_id: str = typer.Argument(
+        ..., callback=parse_user, help="User ID (e.g., 'U0xxx')"
+    ),
+):
+    """
+    Revoke all open todos of a user whose DDL has passed.
+    """
+    revoked = butler.revoke_overdue_todos(user_id, clock.now())
+    ctx.obj.logger.info(f"Revoked {revoked} overdue todos of {user_id}")
+    ctx.obj.say_ephemeral(f"✅ Revoked {revoked} overdue todos of <@{user_id}>.")
+
+
 # --- log command ---
 @alfred_cli_app.command(
     "log", help="• /alfred log <todo_id> (Show log for a specific todo ID)"
@@ -249,6 +374,47 @@ def log_todo(
     say_ephemeral(f"""TODO log for ID {todo_id}:\n{log_string}""")
 
 
+# --- export command ---
+@alfred_cli_app.command(
+    "export",
+    help="• /alfred export <todo_templates|todos|todo_status_logs> [ndjson|csv]",
+)
+def export_table(
+    ctx: typer.Context,
+    table: ExportTable = typer.Argument(..., help="Table to export"),
+    fmt: ExportFormat = typer.Argument(
+        ExportFormat.ndjson, case_sensitive=False, help="ndjson or csv"
+    ),
+):
+    """
+    Export a whole table as a file, sent to the admin in a direct message.
+    Rows are streamed into a temporary file, the table is never loaded at once.
+    """
+    logger = ctx.obj.logger
+    client = ctx.obj.client
+    logger.info(f"Exporting {table.value} as {fmt.value}...")
+
+    filename = f"{table.value}.{fmt.value}"
+    with tempfile.TemporaryDirectory(prefix="alfred-export-") as tmp_dir:
+        path = os.path.join(tmp_dir, filename)
+        with open(path, "w", newline="", encoding="utf-8") as fp:
+            count = write_export(
+                butler.iter_rows(table.value),
+                fp,
+                fmt.value,
+                list(EXPORT_COLUMNS[table.value]),
+            )
+        # the export has everyone's todos, don't post it in the channel
+        dm_channel = client.conversations_open(users=ctx.obj.user_id)["channel"]["id"]
+        client.files_upload_v2(
+            channel=dm_channel,
+            file=path,
+            filename=filename,
+            initial_comment=f"📦 Exported {count} rows of `{table.value}`",
+        )
+    ctx.obj.say_ephemeral(f"✅ Sent `{filename}` ({count} rows) to your DM.")
+
+
 @alfred_cli_app.command("test", help="Send a test Block Kit message")
 def test_send(ctx: typer.Context):
     """
@@ -1,11 +1,11 @@
-from datetime import datetime
 from alfred.slack.app import app
+from alfred.utils import clock
 
 
 @app.event("app_home_opened")
 def update_home_tab(client, event, logger):
     user_id = event["user"]
-    today = datetime.now().date().strftime("%Y-%m-%d")
+    today = clock.now().date().strftime("%Y-%m-%d")
 
     # 1. Get username
     try:
@@ -3,6 +3,8 @@ from apscheduler.executors.pool import ThreadPoolExecutor
 
 from alfred.slack.butler import butler
 from alfred.slack.app import app
+from alfred.task import events
+from alfred.utils import clock
 from alfred.utils.config import get_slack_channel
 
 import logging
@@ -12,18 +14,27 @@ logger = logging.getLogger(__name__)
 
 def patrol_job():
     # read from engine, if todos are due, send reminders
-    with butler.gather_notify_blocks() as blocks:
-        if blocks:
-            res = app.client.chat_postMessage(channel=get_slack_channel(), blocks=blocks, text="Todo Reminder")
-            if not res["ok"]:
-                raise Exception(f"Slack API error: {res}")
+    butler.patrol(app.client, get_slack_channel())
 
-    # if end of day, send summary
-    with butler.gather_end_of_day_summary() as blocks:
-        if blocks:
-            res = app.client.chat_postMessage(channel=get_slack_channel(), blocks=blocks, text="Daily Todo Summary")
-            if not res["ok"]:
-                raise Exception(f"Slack API error: {res}")
+
+def schedule_patrol_at(scheduler, remind_times):
+    """Patrol right when new todos are due instead of on the next interval"""
+    now = clock.now()
+    for remind_time in remind_times:
+        if remind_time <= now:
+            scheduler.add_job(
+                func=patrol_job, id="butler_patrol_now", replace_existing=True
+            )
+        else:
+            scheduler.add_job(
+                func=patrol_job,
+                trigger="date",
+                run_date=remind_time,
+                # one job per distinct time, the same burst is patrolled once
+                id=f"butler_patrol_at_{remind_time.isoformat()}",
+                replace_existing=True,
+                misfire_grace_time=60,
+            )
 
 
 def launch_patrol_scheduler(seconds=60):
@@ -31,6 +42,10 @@ def launch_patrol_scheduler(seconds=60):
     executors = {"default": ThreadPoolExecutor(max_workers=1)}
     scheduler = BackgroundScheduler(executors=executors)
 
+    def on_todos_changed(op, remind_times, **_):
+        if op == "INSERT":
+            schedule_patrol_at(scheduler, remind_times)
+
     try:
         scheduler.add_job(
             func=patrol_job,
@@ -42,6 +57,8 @@ def launch_patrol_scheduler(seconds=60):
         )
 
         scheduler.start()
+        # only published on Postgres, the interval job is the fallback
+        events.subscribe(events.TODOS_CHANGED, on_todos_changed)
         return True
     except Exception as e:
         logger.exception(f"Error starting scheduler: {e}")
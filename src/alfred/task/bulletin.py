@@ -1,27 +1,243 @@
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
 import logging
 from typing import List
-from croniter import croniter
 
-from sqlalchemy import select, func, Date
-
-from alfred.task.vault import get_vault
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    or_,
+    case,
+    bindparam,
+    func,
+    literal,
+    literal_column,
+    text,
+    tuple_,
+    DateTime,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from alfred.task import events
+from alfred.task.cron import fire_times_between, next_fire_time
+from alfred.task.rows import TemplateRow, TodoRow
+from alfred.utils import clock
+from alfred.utils.duration import duration_seconds
+from alfred.task.vault import Vault, get_vault
 from alfred.task.vault.models import (
+    EngineState,
+    NotificationSent,
+    OPEN_STATUSES,
     Todo,
+    TodoArchive,
     TodoTemplate,
     TodoStatusLog,
+    TodoStatusLogArchive,
     TodoStatus,
 )
 
+# cron has minute resolution, so by default each engine pass creates the todos
+# that fire within the next minute
+DEFAULT_LOOKAHEAD = timedelta(minutes=1)
+
+# rows per multi-row INSERT, create_todos binds 7 params per row
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# missed fire times older than this are not backfilled after downtime
+DEFAULT_MAX_LOOKBACK = timedelta(hours=24)
+
+# templates per backfill transaction
+BACKFILL_CHUNK_SIZE = 500
+
+WATERMARK = "watermark"
+# engine_state entry of the last end-of-day summary patrol posted
+SUMMARY_SENT = "summary_sent"
+
+# todos that never change again, candidates for the archive
+FINISHED_STATUSES = (TodoStatus.COMPLETED, TodoStatus.REVOKED)
+
+# todos moved per archive transaction
+ARCHIVE_CHUNK_SIZE = 1000
+
+# todos per page of /alfred list todos
+DEFAULT_PAGE_SIZE = 20
+
+# rows fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# exported columns of each table, in output order
+EXPORT_COLUMNS = {
+    "todo_templates": {
+        "template_id": TodoTemplate.id,
+        "user_id": TodoTemplate.user_id,
+        "content": TodoTemplate.content,
+        "cron": TodoTemplate.cron,
+        "ddl_offset": TodoTemplate.ddl_offset,
+        "is_active": TodoTemplate.is_active,
+        "run_once": TodoTemplate.run_once,
+        "created_at": TodoTemplate.created_at,
+    },
+    "todos": {
+        "todo_id": Todo.id,
+        "template_id": Todo.template_id,
+        "user_id": Todo.user_id,
+        "remind_time": Todo.remind_time,
+        "ddl_time": Todo.ddl_time,
+        "status": Todo.status,
+        "created_at": Todo.created_at,
+        "updated_at": Todo.updated_at,
+    },
+    "todo_status_logs": {
+        "log_id": TodoStatusLog.id,
+        "todo_id": TodoStatusLog.todo_id,
+        "old_status": TodoStatusLog.old_status,
+        "new_status": TodoStatusLog.new_status,
+        "changed_at": TodoStatusLog.changed_at,
+    },
+}
+
+
+def _dialect_insert(session, model):
+    """INSERT supporting ON CONFLICT clauses for the dialect bound to `session`"""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    elif dialect == "sqlite":
+        return sqlite.insert(model)
+    raise ValueError(f"Unsupported dialect for upsert: {dialect}")
+
+
+def _is_open():
+    """status IN ('PENDING', 'ESCALATED') with inlined values.
+
+    SQLite only uses the partial index idx_todos_open_remind if the query
+    repeats its predicate literally, bound parameters don't match.
+    """
+    return Todo.status.in_(
+        bindparam("open_statuses", list(OPEN_STATUSES), literal_execute=True)
+    )
+
+
+def _month_starts(first: datetime, last: datetime):
+    month = date(first.year, first.month, 1)
+    while month <= last.date():
+        yield month
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _ensure_month_partitions(session, table: str, first: datetime, last: datetime):
+    """Create the monthly partitions of `table` covering [first, last], Postgres only"""
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    for month in _month_starts(first, last):
+        next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+            )
+        )
+
+
+def _select_todo_rows(model=Todo):
+    """The TodoRow columns of `model` (Todo or TodoArchive) joined with its template"""
+    return select(
+        model.id,
+        TodoTemplate.id,
+        TodoTemplate.content,
+        model.user_id,
+        model.status,
+        model.remind_time,
+        model.ddl_time,
+    ).join(TodoTemplate, model.template_id == TodoTemplate.id)
+
+
+def _todo_row(row) -> TodoRow:
+    todo_id, template_id, content, user_id, status, remind_time, ddl_time = row
+    return TodoRow(
+        todo_id, template_id, content, user_id, status.value, remind_time, ddl_time
+    )
+
+
+def _transition_ctes(criteria, from_statuses, to_status, current_time, *returning):
+    """
+    Postgres CTEs moving the todos matching `criteria` from `from_statuses` to
+    `to_status` and logging each change, to be added to one statement:
+
+        WITH old AS (SELECT todo_id, status ... FOR UPDATE),
+             upd AS (UPDATE todos ... FROM old RETURNING todo_id, old.status, ...),
+             log AS (INSERT INTO todo_status_logs SELECT ... FROM upd)
+
+    Returns (upd, log), `returning` are extra Todo columns of upd.
+    """
+    old = (
+        select(Todo.id.label("todo_id"), Todo.status.label("old_status"))
+        .where(*criteria, Todo.status.in_(from_statuses))
+        .with_for_update()
+        .cte("old")
+    )
+    upd = (
+        update(Todo)
+        # the status is checked again on the locked rows
+        .where(Todo.id == old.c.todo_id, Todo.status.in_(from_statuses))
+        .values(status=to_status, updated_at=current_time)
+        .returning(Todo.id.label("todo_id"), old.c.old_status, *returning)
+        .cte("upd")
+    )
+    log = insert(TodoStatusLog).from_select(
+        ["todo_id", "old_status", "new_status", "changed_at"],
+        select(
+            upd.c.todo_id,
+            upd.c.old_status,
+            literal(to_status, TodoStatusLog.new_status.type),
+            literal(current_time, DateTime),
+        ),
+    )
+    return upd, log.cte("log")
+
+
+def encode_cursor(todo) -> str:
+    """Page cursor of a todo dict: its position in (remind_time, todo_id) order"""
+    return f"{todo['remind_time'].isoformat()}|{todo['todo_id']}"
+
+
+def decode_cursor(cursor: str):
+    """
+    Raises:
+        ValueError: if `cursor` was not made by encode_cursor
+    """
+    remind_time, sep, todo_id = cursor.rpartition("|")
+    if not sep:
+        raise ValueError(f"Invalid page cursor: '{cursor}'")
+    return datetime.fromisoformat(remind_time), int(todo_id)
+
+
+def _claim_rows(session, stmt):
+    """Lock selected rows FOR UPDATE SKIP LOCKED, so concurrent engines split them.
+
+    Postgres only, SQLite has no row locks and runs a single engine process.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return stmt.with_for_update(skip_locked=True)
+    return stmt
+
 
 class Bulletin:
     """
     Read raw meta data from singleton vault instance. Manage templates and todos.
     """
 
-    def __init__(self):
+    def __init__(self, vault: Vault | None = None):
         self.logger = logging.getLogger(__name__)
-        self.vault = get_vault()
+        # resolved on first use, so module level instances don't open the default vault
+        self._vault = vault
+
+    @property
+    def vault(self) -> Vault:
+        if self._vault is None:
+            self._vault = get_vault()
+        return self._vault
 
     def run_in_session(self):
         """Provide a transactional session scope.
@@ -32,302 +248,496 @@ class Bulletin:
         """
         return self.vault.session_scope()
 
-    def _parse_offset(self, offset_str: str) -> timedelta:
-        """handle simple ddl_offset like '5m', '2h', '1d' etc."""
-        unit = offset_str[-1]
-        value = int(offset_str[:-1])
-        if unit == "s":
-            return timedelta(seconds=value)
-        elif unit == "m":
-            return timedelta(minutes=value)
-        elif unit == "h":
-            return timedelta(hours=value)
-        elif unit == "d":
-            return timedelta(days=value)
-        else:
-            raise ValueError(f"Unsupported offset unit: {unit}")
+    def read_your_writes(self):
+        """
+        Within this block the read methods query the primary, not the replica.
+
+        Usage:
+            with bulletin.read_your_writes():
+                bulletin.complete_todo(todo_id, now)
+                todo = bulletin.get_todo(todo_id)
+        """
+        return self.vault.pin_primary()
+
+    def _offset_seconds(self, template: TodoTemplate) -> int:
+        """ddl offset of `template` in seconds, parsed once for templates stored before the column"""
+        if template.ddl_offset_seconds is None:
+            template.ddl_offset_seconds = duration_seconds(template.ddl_offset)
+        return template.ddl_offset_seconds
 
     def create_todo(
         self,
         session,
         user_id: str,
         template_id: int,
-        ddl_offset: str,
+        ddl_offset_seconds: int,
         remind_time: datetime,
         create_time: datetime,
-    ) -> int:
+    ) -> int | None:
         """Create a new todo and its initial status log.
 
         Args:
             session: Active SQLAlchemy session
             user_id: User ID
             template_id: Template ID
-            ddl_offset: Deadline offset string (e.g., '5m', '2h', '1d')
+            ddl_offset_seconds: Deadline offset after remind_time, in seconds
             remind_time: When to remind
             create_time: Creation timestamp
 
         Returns:
-            Created todo ID
+            Created todo ID, None if the todo already exists
         """
-        # Calculate DDL time
-        ddl_time = remind_time + self._parse_offset(ddl_offset)
-
-        # Create Todo object
-        new_todo = Todo(
-            template_id=template_id,
-            user_id=user_id,
-            status=TodoStatus.PENDING,
-            remind_time=remind_time,
-            ddl_time=ddl_time,
-            created_at=create_time,
-            updated_at=create_time,
-        )
-        session.add(new_todo)
-        session.flush()
-        todo_id = new_todo.id
-
-        # Create status log
-        new_log = TodoStatusLog(
-            todo_id=todo_id,
-            old_status=None,
-            new_status=TodoStatus.PENDING,
-            changed_at=create_time,
+        todo_ids = self.create_todos(
+            session,
+            [
+                {
+                    "template_id": template_id,
+                    "user_id": user_id,
+                    "ddl_offset_seconds": ddl_offset_seconds,
+                    "remind_time": remind_time,
+                }
+            ],
+            create_time,
         )
-        session.add(new_log)
+        return todo_ids[0] if todo_ids else None
 
-        return todo_id
+    def create_todos(self, session, todos, create_time: datetime) -> List[int]:
+        """Create many todos and their initial status logs with multi-row INSERTs.
 
-    def complete_todo(self, todo_id: int, current_time: datetime | str):
-        """User completes a todo"""
-        if isinstance(current_time, str):
-            current_time = datetime.fromisoformat(current_time)
-        self.logger.info(f"--- [USER] Completing Todo {todo_id} at {current_time} ---")
-        try:
-            with self.vault.session_scope() as session:
-                todo = session.get(Todo, todo_id)
-                if todo is None:
-                    self.logger.error(f"ERROR: Todo {todo_id} not found.")
-                    return
+        Per BULK_INSERT_CHUNK_SIZE todos this costs one
+        INSERT ... ON CONFLICT DO NOTHING RETURNING for the todos and one INSERT
+        for the PENDING logs. Todos that already exist for the same
+        (template_id, user_id, remind_time) are rejected by the unique index in
+        the same statement, so concurrent or retried passes never duplicate.
 
-                old_status = todo.status
-                if old_status in (TodoStatus.COMPLETED, TodoStatus.REVOKED):
-                    self.logger.info(
-                        f"Todo {todo_id} is already in a final state ({old_status.value})."
-                    )
-                    return
+        Args:
+            session: Active SQLAlchemy session
+            todos: List of dicts with 'template_id', 'user_id',
+                   'ddl_offset_seconds' and 'remind_time'
+            create_time: Creation timestamp
 
-                todo.status = TodoStatus.COMPLETED
-                todo.updated_at = current_time
+        Returns:
+            Created todo IDs, in the same order as `todos`, existing ones skipped
+        """
+        todo_ids = []
+        for start in range(0, len(todos), BULK_INSERT_CHUNK_SIZE):
+            chunk = todos[start : start + BULK_INSERT_CHUNK_SIZE]
+            rows = session.execute(
+                _dialect_insert(session, Todo)
+                .on_conflict_do_nothing(
+                    index_elements=["template_id", "user_id", "remind_time"]
+                )
+                .values(
+                    [
+                        {
+                            "template_id": todo["template_id"],
+                            "user_id": todo["user_id"],
+                            "status": TodoStatus.PENDING,
+                            "remind_time": todo["remind_time"],
+                            "ddl_time": todo["remind_time"]
+                            + timedelta(seconds=todo["ddl_offset_seconds"]),
+                            "created_at": create_time,
+                            "updated_at": create_time,
+                        }
+                        for todo in chunk
+                    ]
+                )
+                .returning(Todo.id, Todo.template_id, Todo.user_id, Todo.remind_time)
+            ).all()
+            if not rows:
+                continue
+            # multi-row RETURNING order is not guaranteed, match rows by key
+            id_by_key = {
+                (row.template_id, row.user_id, row.remind_time): row.id for row in rows
+            }
+            chunk_ids = [
+                id_by_key[key]
+                for key in (
+                    (todo["template_id"], todo["user_id"], todo["remind_time"])
+                    for todo in chunk
+                )
+                if key in id_by_key
+            ]
+
+            session.execute(
+                insert(TodoStatusLog).values(
+                    [
+                        {
+                            "todo_id": todo_id,
+                            "old_status": None,
+                            "new_status": TodoStatus.PENDING,
+                            "changed_at": create_time,
+                        }
+                        for todo_id in chunk_ids
+                    ]
+                )
+            )
+            todo_ids.extend(chunk_ids)
 
-                log = TodoStatusLog(
+        return todo_ids
+
+    def _transition(
+        self, session, todo_id: int, from_statuses, to_status, current_time
+    ) -> TodoRow | None:
+        """
+        Move a todo to `to_status` if it is in one of `from_statuses`, and log it.
+
+        The status check and the change are one conditional UPDATE, so of two
+        concurrent transitions only one wins. Returns the changed todo, None if
+        it doesn't exist or is in another status.
+        """
+        if session.bind.dialect.name == "postgresql":
+            return self._transition_returning_cte(
+                session, todo_id, from_statuses, to_status, current_time
+            )
+
+        # SQLite can't RETURN the old status, try the candidates one by one;
+        # a single UPDATE is atomic and writers are serialized anyway
+        # RETURNING renders bare column names, and todo_templates has a
+        # template_id too, so the correlation is spelled out
+        content = (
+            select(TodoTemplate.content)
+            .where(TodoTemplate.id == literal_column("todos.template_id"))
+            .scalar_subquery()
+        )
+        for old_status in from_statuses:
+            row = session.execute(
+                update(Todo)
+                .where(Todo.id == todo_id, Todo.status == old_status)
+                .values(status=to_status, updated_at=current_time)
+                .returning(
+                    Todo.id,
+                    Todo.template_id,
+                    content,
+                    Todo.user_id,
+                    Todo.remind_time,
+                    Todo.ddl_time,
+                )
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+            if row is None:
+                continue
+            session.execute(
+                insert(TodoStatusLog).values(
                     todo_id=todo_id,
                     old_status=old_status,
-                    new_status=TodoStatus.COMPLETED,
+                    new_status=to_status,
                     changed_at=current_time,
                 )
-                session.add(log)
+            )
+            todo_id, template_id, content, user_id, remind_time, ddl_time = row
+            return TodoRow(
+                todo_id,
+                template_id,
+                content,
+                user_id,
+                to_status.value,
+                remind_time,
+                ddl_time,
+            )
+        return None
+
+    def _transition_returning_cte(
+        self, session, todo_id: int, from_statuses, to_status, current_time
+    ) -> TodoRow | None:
+        # one round trip: the CTEs, then the todo joined with its template
+        upd, log = _transition_ctes(
+            [Todo.id == todo_id],
+            from_statuses,
+            to_status,
+            current_time,
+            Todo.template_id,
+            Todo.user_id,
+            Todo.remind_time,
+            Todo.ddl_time,
+        )
+        row = session.execute(
+            select(
+                upd.c.todo_id,
+                upd.c.template_id,
+                TodoTemplate.content,
+                upd.c.user_id,
+                upd.c.remind_time,
+                upd.c.ddl_time,
+            )
+            .join_from(upd, TodoTemplate, TodoTemplate.id == upd.c.template_id)
+            .add_cte(log)
+        ).one_or_none()
+        if row is None:
+            return None
+        todo_id, template_id, content, user_id, remind_time, ddl_time = row
+        return TodoRow(
+            todo_id, template_id, content, user_id, to_status.value, remind_time, ddl_time
+        )
 
-            self.logger.info(f"COMPLETED Todo {todo_id} (was {old_status.value})")
+    def complete_todo(
+        self, todo_id: int, current_time: datetime | str
+    ) -> TodoRow | None:
+        """User completes a todo, returns the completed todo or None if it wasn't open"""
+        if isinstance(current_time, str):
+            current_time = datetime.fromisoformat(current_time)
+        self.logger.info(f"--- [USER] Completing Todo {todo_id} at {current_time} ---")
+        try:
+            with self.vault.session_scope() as session:
+                todo = self._transition(
+                    session, todo_id, OPEN_STATUSES, TodoStatus.COMPLETED, current_time
+                )
+            if todo is None:
+                self.logger.info(
+                    f"Todo {todo_id} not found or already in a final state."
+                )
+            else:
+                self.logger.info(f"COMPLETED Todo {todo_id}")
+            return todo
         except Exception as e:
             self.logger.error(f"ERROR completing Todo {todo_id}: {e}")
 
-    def revert_todo_completion(self, todo_id: int, current_time: datetime | str):
-        """user reverts a completed todo back to pending/escalated"""
+    def revert_todo_completion(
+        self, todo_id: int, current_time: datetime | str
+    ) -> TodoRow | None:
+        """user reverts a completed todo back to pending, returns the todo or None if it wasn't completed"""
         if isinstance(current_time, str):
             current_time = datetime.fromisoformat(current_time)
         self.logger.info(f"--- [USER] Reverting Todo {todo_id} at {current_time} ---")
         try:
             with self.vault.session_scope() as session:
-                todo = session.get(Todo, todo_id)
-                if todo is None:
-                    self.logger.error(f"ERROR: Todo {todo_id} not found.")
-                    return
-
-                old_status = todo.status
-
-                if old_status != TodoStatus.COMPLETED:
-                    self.logger.error(
-                        f"ERROR: Todo {todo_id} is not 'completed'. Cannot revert."
-                    )
-                    return
-
-                todo.status = TodoStatus.PENDING
-                todo.updated_at = current_time
-
-                log = TodoStatusLog(
-                    todo_id=todo_id,
-                    old_status=old_status,
-                    new_status=TodoStatus.PENDING,
-                    changed_at=current_time,
+                todo = self._transition(
+                    session,
+                    todo_id,
+                    (TodoStatus.COMPLETED,),
+                    TodoStatus.PENDING,
+                    current_time,
                 )
-                session.add(log)
-
+            if todo is None:
+                self.logger.error(
+                    f"ERROR: Todo {todo_id} not found or not 'completed'. Cannot revert."
+                )
+            else:
                 self.logger.info(
                     f"REVERTED Todo {todo_id} from 'completed' back to 'pending'"
                 )
+            return todo
         except Exception as e:
             self.logger.error(f"ERROR reverting Todo {todo_id}: {e}")
 
+    def _bulk_transition(
+        self, session, criteria, from_statuses, to_status, current_time
+    ) -> int:
+        """
+        Move every todo matching `criteria` from `from_statuses` to `to_status`
+        and log each change, returns how many were moved.
+
+        One UPDATE and one INSERT ... SELECT however many todos match (a single
+        statement on Postgres), instead of a round trip per todo.
+        """
+        if session.bind.dialect.name == "postgresql":
+            upd, log = _transition_ctes(
+                criteria, from_statuses, to_status, current_time
+            )
+            return session.execute(
+                select(func.count()).select_from(upd).add_cte(log)
+            ).scalar_one()
+
+        # log first, while the rows still have their old status; the INSERT
+        # takes SQLite's write lock, so nothing changes them in between
+        logged = session.execute(
+            insert(TodoStatusLog).from_select(
+                ["todo_id", "old_status", "new_status", "changed_at"],
+                select(
+                    Todo.id,
+                    Todo.status,
+                    literal(to_status, TodoStatusLog.new_status.type),
+                    literal(current_time, DateTime),
+                ).where(*criteria, Todo.status.in_(from_statuses)),
+            )
+        )
+        session.execute(
+            update(Todo)
+            .where(*criteria, Todo.status.in_(from_statuses))
+            .values(status=to_status, updated_at=current_time)
+            .execution_options(synchronize_session=False)
+        )
+        return logged.rowcount
+
     def set_template_active_status(
         self, template_id: int, is_active: bool, current_time: datetime | str
     ):
         """admin activates/deactivates a template"""
+        return self.set_templates_active_status([template_id], is_active, current_time)
+
+    def set_templates_active_status(
+        self, template_ids: List[int], is_active: bool, current_time: datetime | str
+    ):
+        """
+        admin activates/deactivates templates, deactivating revokes their open todos
+
+        Returns:
+            dict with the "template_ids" that exist and were changed, and the
+            number of "revoked" todos
+        """
         if isinstance(current_time, str):
             current_time = datetime.fromisoformat(current_time)
         status_str = "Activating" if is_active else "Deactivating"
         self.logger.info(
-            f"--- [ADMIN] {status_str} Template {template_id} at {current_time} ---"
+            f"--- [ADMIN] {status_str} Templates {template_ids} at {current_time} ---"
         )
 
+        result = {"template_ids": [], "revoked": 0}
         try:
             with self.vault.session_scope() as session:
-                template = session.get(TodoTemplate, template_id)
-                if template is None:
-                    self.logger.error(f"ERROR: Template {template_id} not found.")
-                    return
-
-                template.is_active = bool(is_active)
-
-                todos_to_revoke: List[Todo] = []
-                if not is_active:
-                    todos_to_revoke = (
+                if is_active:
+                    templates = (
                         session.execute(
-                            select(Todo).where(
-                                Todo.template_id == template_id,
-                                Todo.status.in_(
-                                    [TodoStatus.PENDING, TodoStatus.ESCALATED]
-                                ),
+                            select(TodoTemplate).where(
+                                TodoTemplate.id.in_(template_ids)
                             )
                         )
                         .scalars()
                         .all()
                     )
-
-                    if not todos_to_revoke:
-                        self.logger.info("No active todos to revoke.")
-
-                    for todo in todos_to_revoke:
-                        old_status = todo.status
-                        self.logger.info(
-                            f"REVOKING Todo {todo.id} (was {old_status.value})..."
+                    for template in templates:
+                        template.is_active = True
+                        # fire times missed while inactive are not replayed
+                        template.next_fire_at = next_fire_time(
+                            template.cron, current_time
                         )
-                        todo.status = TodoStatus.REVOKED
-                        todo.updated_at = current_time
-
-                        log = TodoStatusLog(
-                            todo_id=todo.id,
-                            old_status=old_status,
-                            new_status=TodoStatus.REVOKED,
-                            changed_at=current_time,
+                    changed = [template.id for template in templates]
+                else:
+                    changed = (
+                        session.execute(
+                            update(TodoTemplate)
+                            .where(TodoTemplate.id.in_(template_ids))
+                            .values(is_active=False)
+                            .returning(TodoTemplate.id)
+                            .execution_options(synchronize_session=False)
                         )
-                        session.add(log)
-
-                self.logger.info(
-                    f"Successfully set Template {template_id} active status to {is_active}"
-                )
-                if not is_active and todos_to_revoke:
-                    self.logger.info(
-                        f"Revoked {len(todos_to_revoke)} associated todos."
+                        .scalars()
+                        .all()
                     )
+                    if changed:
+                        result["revoked"] = self._bulk_transition(
+                            session,
+                            [Todo.template_id.in_(changed)],
+                            OPEN_STATUSES,
+                            TodoStatus.REVOKED,
+                            current_time,
+                        )
+                result["template_ids"] = sorted(changed)
+
+            missing = set(template_ids) - set(changed)
+            if missing:
+                self.logger.error(f"ERROR: Templates {sorted(missing)} not found.")
+            self.logger.info(
+                f"Successfully set Templates {result['template_ids']} active status to {is_active}"
+            )
+            if result["revoked"]:
+                self.logger.info(f"Revoked {result['revoked']} associated todos.")
+            for template_id in result["template_ids"]:
+                events.publish(events.TEMPLATE_CHANGED, template_id=template_id)
         except Exception as e:
             self.logger.error(f"ERROR changing template status: {e}")
+        return result
+
+    def revoke_overdue_todos(self, user_id: str, current_time: datetime | str) -> int:
+        """admin revokes the open todos of a user whose ddl has passed, returns how many"""
+        if isinstance(current_time, str):
+            current_time = datetime.fromisoformat(current_time)
+        self.logger.info(
+            f"--- [ADMIN] Revoking overdue todos of {user_id} at {current_time} ---"
+        )
+        with self.vault.session_scope() as session:
+            revoked = self._bulk_transition(
+                session,
+                [Todo.user_id == user_id, Todo.ddl_time < current_time],
+                OPEN_STATUSES,
+                TodoStatus.REVOKED,
+                current_time,
+            )
+        self.logger.info(f"Revoked {revoked} overdue todos of {user_id}")
+        return revoked
 
     def add_template(self, user_id, content, cron, ddl_offset, run_once) -> int:
         """
         Add a new task template for a todo.
         Returns the template_id of the newly created template.
+        Raises ValueError if ddl_offset is not a duration such as '30m' or '1h30m'.
         """
         self.logger.info(f"Adding template for {user_id}: {content}")
+        # validated once here, the engine only does arithmetic on the seconds
+        ddl_offset_seconds = duration_seconds(ddl_offset)
         with self.vault.session_scope() as session:
             template = TodoTemplate(
                 user_id=user_id,
                 content=content,
                 cron=cron,
                 ddl_offset=ddl_offset,
+                ddl_offset_seconds=ddl_offset_seconds,
                 run_once=bool(int(run_once)),
+                # same clock as the engine, it seeds the first fire time from here
+                created_at=clock.now(),
             )
             session.add(template)
             session.flush()
             template_id = template.id
             self.logger.info(f"Added template {template_id} for {user_id}")
+        events.publish(events.TEMPLATE_CHANGED, template_id=template_id)
         return template_id
 
     def fetch_all(self):
         """
         Return dictionary of all tables and their rows.
+        Loads everything into memory, use iter_rows to stream big tables.
         """
         self.logger.info(f"[QUERY] Fetching all data from all tables")
-        all_data = {}
-        with self.vault.session_scope() as session:
-            templates = session.execute(select(TodoTemplate)).scalars().all()
-            todos = session.execute(select(Todo)).scalars().all()
-            logs = session.execute(select(TodoStatusLog)).scalars().all()
+        return {table: list(self.iter_rows(table)) for table in EXPORT_COLUMNS}
 
-            all_data["todo_templates"] = [
-                {
-                    "template_id": t.id,
-                    "user_id": t.user_id,
-                    "content": t.content,
-                    "cron": t.cron,
-                    "ddl_offset": t.ddl_offset,
-                    "is_active": t.is_active,
-                    "run_once": t.run_once,
-                    "created_at": t.created_at,
-                }
-                for t in templates
-            ]
+    def iter_rows(self, table: str, batch_size: int = EXPORT_BATCH_SIZE):
+        """
+        Yield the rows of `table` as dicts, in primary key order.
 
-            all_data["todos"] = [
-                {
-                    "todo_id": td.id,
-                    "template_id": td.template_id,
-                    "user_id": td.user_id,
-                    "remind_time": td.remind_time,
-                    "ddl_time": td.ddl_time,
-                    "status": td.status.value,
-                    "created_at": td.created_at,
-                    "updated_at": td.updated_at,
-                }
-                for td in todos
-            ]
+        Rows are fetched `batch_size` at a time (a server side cursor on
+        Postgres), so memory stays flat however big the table is. The session
+        stays open until the generator is exhausted or closed.
 
-            all_data["todo_status_logs"] = [
-                {
-                    "log_id": l.id,
-                    "todo_id": l.todo_id,
-                    "old_status": (
-                        l.old_status.value if l.old_status is not None else None
-                    ),
-                    "new_status": (l.new_status.value,),
-                    "changed_at": l.changed_at,
+        Raises:
+            ValueError: if `table` is not one of EXPORT_COLUMNS
+        """
+        if table not in EXPORT_COLUMNS:
+            raise ValueError(
+                f"Unknown table '{table}', expected one of {', '.join(EXPORT_COLUMNS)}"
+            )
+        columns = EXPORT_COLUMNS[table]
+        names = list(columns)
+        stmt = (
+            select(*(column.label(name) for name, column in columns.items()))
+            .order_by(next(iter(columns.values())))
+            .execution_options(yield_per=batch_size)
+        )
+        self.logger.info(f"[QUERY] Streaming {table}, {batch_size} rows per batch")
+        with self.vault.read_scope() as session:
+            for row in session.execute(stmt):
+                yield {
+                    name: value.value if isinstance(value, TodoStatus) else value
+                    for name, value in zip(names, row)
                 }
-                for l in logs
-            ]
-
-        return all_data
 
-    def get_templates(self):
+    def get_templates(self) -> List[TemplateRow]:
         """get all todo templates"""
         self.logger.info(f"[QUERY] Getting all todo templates")
-        with self.vault.session_scope() as session:
-            templates = (
-                session.execute(select(TodoTemplate).order_by(TodoTemplate.id))
-                .scalars()
-                .all()
+        with self.vault.read_scope() as session:
+            rows = session.execute(
+                select(
+                    TodoTemplate.id,
+                    TodoTemplate.user_id,
+                    TodoTemplate.content,
+                    TodoTemplate.cron,
+                    TodoTemplate.ddl_offset,
+                    TodoTemplate.is_active,
+                    TodoTemplate.run_once,
+                    TodoTemplate.created_at,
+                ).order_by(TodoTemplate.id)
             )
-            return [
-                {
-                    "template_id": t.id,
-                    "user_id": t.user_id,
-                    "content": t.content,
-                    "cron": t.cron,
-                    "ddl_offset": t.ddl_offset,
-                    "is_active": t.is_active,
-                    "run_once": t.run_once,
-                    "created_at": t.created_at,
-                }
-                for t in templates
-            ]
+            return [TemplateRow(*row) for row in rows]
 
     def get_active_templates(self, session):
         """Get all active templates (returns ORM objects).
@@ -341,6 +751,351 @@ class Bulletin:
         stmt = select(TodoTemplate).where(TodoTemplate.is_active == True)
         return session.execute(stmt).scalars().all()
 
+    def get_due_templates(self, session, horizon: datetime):
+        """Get active templates that fire at or before `horizon` (returns ORM objects).
+
+        Templates never scheduled before (next_fire_at is NULL) are always due,
+        so that the engine can seed their next fire time. On Postgres the rows
+        stay locked until the session commits, templates locked by another
+        engine process are skipped.
+
+        Args:
+            session: Active SQLAlchemy session
+            horizon: Upper bound of the scheduling window
+
+        Returns:
+            List of due TodoTemplate ORM objects
+        """
+        stmt = select(TodoTemplate).where(
+            TodoTemplate.is_active == True,
+            or_(
+                TodoTemplate.next_fire_at.is_(None),
+                TodoTemplate.next_fire_at <= horizon,
+            ),
+        )
+        return session.execute(_claim_rows(session, stmt)).scalars().all()
+
+    def advance_fire_times(
+        self,
+        template: TodoTemplate,
+        current_time: datetime,
+        horizon: datetime,
+        memo: dict | None = None,
+    ) -> List[datetime]:
+        """Collect fire times of `template` up to `horizon` and advance next_fire_at.
+
+        A template never scheduled before starts from its creation time if that
+        is inside the last window, so a template added between two rare passes
+        of a wide horizon still gets its first fire times. Fire times older than
+        one scheduling window (e.g. missed while the engine was down) are
+        skipped, the template is realigned to `current_time`.
+
+        Args:
+            template: TodoTemplate ORM object, next_fire_at is updated in place
+            current_time: Current timestamp
+            horizon: Upper bound of the scheduling window
+            memo: Optional dict shared by the templates of one pass, templates
+                with the same cron and starting point are evaluated once
+
+        Returns:
+            Fire times in (window start, horizon], in ascending order
+        """
+        window_start = current_time - (horizon - current_time)
+        next_fire_at = template.next_fire_at
+        if next_fire_at is None:
+            start = template.created_at
+            if start is None or not window_start <= start <= current_time:
+                start = current_time
+            key = (template.cron, template.run_once, start, None)
+        elif next_fire_at < window_start:
+            key = (template.cron, template.run_once, current_time, None)
+        else:
+            key = (template.cron, template.run_once, None, next_fire_at)
+
+        if memo is None or key not in memo:
+            cron, run_once, start, first = key
+            if first is None:
+                first = next_fire_time(cron, start)
+            result = fire_times_between(cron, first, horizon, run_once)
+            if memo is not None:
+                memo[key] = result
+        else:
+            result = memo[key]
+
+        fire_times, template.next_fire_at = result
+        return list(fire_times)
+
+    def get_next_fire_times(self, session, template_ids=None):
+        """Get (template_id, next_fire_at) of active templates.
+
+        Args:
+            session: Active SQLAlchemy session
+            template_ids: Only these templates, defaults to all
+
+        Returns:
+            List of (template_id, next_fire_at) tuples, next_fire_at is None
+            for templates not scheduled yet
+        """
+        stmt = select(TodoTemplate.id, TodoTemplate.next_fire_at).where(
+            TodoTemplate.is_active == True
+        )
+        if template_ids is not None:
+            stmt = stmt.where(TodoTemplate.id.in_(template_ids))
+        return [tuple(row) for row in session.execute(stmt)]
+
+    def get_watermark(self, session) -> datetime | None:
+        """Get the time up to which the engine has scheduled todos.
+
+        Args:
+            session: Active SQLAlchemy session
+
+        Returns:
+            Watermark timestamp, None if the engine never completed a pass
+        """
+        state = session.get(EngineState, WATERMARK)
+        return state.value if state is not None else None
+
+    def advance_watermark(self, session, watermark: datetime):
+        """Move the engine watermark forward, never backward.
+
+        Args:
+            session: Active SQLAlchemy session
+            watermark: Time up to which todos have been scheduled
+        """
+        stmt = _dialect_insert(session, EngineState).values(
+            name=WATERMARK, value=watermark
+        )
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={
+                    "value": case(
+                        (stmt.excluded.value > EngineState.value, stmt.excluded.value),
+                        else_=EngineState.value,
+                    )
+                },
+            )
+        )
+
+    def backfill_todos(
+        self,
+        current_time: datetime | str,
+        max_lookback: timedelta = DEFAULT_MAX_LOOKBACK,
+        chunk_size: int = BACKFILL_CHUNK_SIZE,
+    ) -> int:
+        """Create the todos whose fire time passed while the engine was not running.
+
+        Only runs when the persisted watermark is behind `current_time`, i.e.
+        after downtime or a misfired pass; the watermark only decides whether to
+        run. Each scheduled template is walked from its own next_fire_at, but not
+        further back than `max_lookback`, up to `current_time`. A template whose
+        fire times can't be computed is logged and skipped. Templates are handled `chunk_size` at a time, each chunk
+        in its own transaction with bulk inserts, so a long outage becomes a
+        bounded bulk job. Templates never scheduled before are left to
+        schedule_todos.
+
+        Args:
+            current_time: Current timestamp
+            max_lookback: Fire times older than current_time - max_lookback are skipped
+            chunk_size: Templates per transaction
+
+        Returns:
+            Number of todos created
+        """
+        if isinstance(current_time, str):
+            current_time = datetime.fromisoformat(current_time)
+
+        with self.run_in_session() as session:
+            watermark = self.get_watermark(session)
+        if watermark is None or watermark >= current_time:
+            return 0
+
+        floor = current_time - max_lookback
+        self.logger.debug(
+            f"[Backfill] Engine watermark {watermark} is behind {current_time}, "
+            f"backfilling from each template's next_fire_at, not before {floor}"
+        )
+
+        created_count = 0
+        # keyset over template ids, a skipped template stays stale and must not
+        # be claimed again
+        last_id = 0
+        while True:
+            with self.run_in_session() as session:
+                stale_templates = (
+                    session.execute(
+                        _claim_rows(
+                            session,
+                            select(TodoTemplate)
+                            .where(
+                                TodoTemplate.is_active == True,
+                                TodoTemplate.next_fire_at <= current_time,
+                                TodoTemplate.id > last_id,
+                            )
+                            .order_by(TodoTemplate.id)
+                            .limit(chunk_size),
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not stale_templates:
+                    break
+
+                last_id = stale_templates[-1].id
+
+                new_todos = []
+                for template in stale_templates:
+                    try:
+                        first = template.next_fire_at
+                        if first < floor:
+                            first = next_fire_time(template.cron, floor)
+                        fire_times, template.next_fire_at = fire_times_between(
+                            template.cron, first, current_time, template.run_once
+                        )
+                    except Exception as e:
+                        self.logger.error(
+                            f"[Backfill] ERROR processing template {template.id} / "
+                            f"{template.content}: {e}"
+                        )
+                        continue
+                    for fire_time in fire_times:
+                        new_todos.append(
+                            {
+                                "template_id": template.id,
+                                "user_id": template.user_id,
+                                "ddl_offset_seconds": self._offset_seconds(template),
+                                "remind_time": fire_time,
+                            }
+                        )
+                    if template.run_once and fire_times:
+                        template.is_active = False
+
+                todo_ids = self.create_todos(session, new_todos, current_time)
+                created_count += len(todo_ids)
+                self.logger.info(
+                    f"[Backfill] Created {len(todo_ids)} missed todo for "
+                    f"{len(stale_templates)} templates."
+                )
+
+        return created_count
+
+    def archive_todos(
+        self,
+        current_time: datetime | str,
+        max_age: timedelta,
+        chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    ) -> int:
+        """Move finished todos and their logs to the archive tables.
+
+        Completed and revoked todos reminded more than `max_age` before
+        `current_time` leave the hot tables, chunk by chunk, each chunk in its
+        own transaction. On Postgres the monthly partitions they land in are
+        created on demand, and rows are claimed with SKIP LOCKED like the
+        engine does.
+
+        Args:
+            current_time: Current timestamp
+            max_age: Finished todos younger than this stay in the hot tables
+            chunk_size: Todos moved per transaction
+
+        Returns:
+            Number of archived todos
+        """
+        if isinstance(current_time, str):
+            current_time = datetime.fromisoformat(current_time)
+        cutoff = current_time - max_age
+
+        archived_count = 0
+        while True:
+            with self.run_in_session() as session:
+                rows = session.execute(
+                    _claim_rows(
+                        session,
+                        select(Todo.id, Todo.remind_time)
+                        .where(
+                            Todo.remind_time < cutoff,
+                            Todo.status.in_(FINISHED_STATUSES),
+                        )
+                        .order_by(Todo.id)
+                        .limit(chunk_size),
+                    )
+                ).all()
+                if not rows:
+                    break
+                todo_ids = [row.id for row in rows]
+
+                # logs first, they reference the todos
+                first_log, last_log = session.execute(
+                    select(
+                        func.min(TodoStatusLog.changed_at),
+                        func.max(TodoStatusLog.changed_at),
+                    ).where(TodoStatusLog.todo_id.in_(todo_ids))
+                ).one()
+                if first_log is not None:
+                    _ensure_month_partitions(
+                        session, TodoStatusLogArchive.__tablename__, first_log, last_log
+                    )
+                session.execute(
+                    insert(TodoStatusLogArchive).from_select(
+                        ["log_id", "changed_at", "todo_id", "old_status", "new_status"],
+                        select(
+                            TodoStatusLog.id,
+                            TodoStatusLog.changed_at,
+                            TodoStatusLog.todo_id,
+                            TodoStatusLog.old_status,
+                            TodoStatusLog.new_status,
+                        ).where(TodoStatusLog.todo_id.in_(todo_ids)),
+                    )
+                )
+                session.execute(
+                    delete(TodoStatusLog).where(TodoStatusLog.todo_id.in_(todo_ids))
+                )
+                # finished todos are never reminded again, nothing to keep
+                session.execute(
+                    delete(NotificationSent).where(
+                        NotificationSent.todo_id.in_(todo_ids)
+                    )
+                )
+
+                _ensure_month_partitions(
+                    session,
+                    TodoArchive.__tablename__,
+                    min(row.remind_time for row in rows),
+                    max(row.remind_time for row in rows),
+                )
+                session.execute(
+                    insert(TodoArchive).from_select(
+                        [
+                            "todo_id",
+                            "remind_time",
+                            "template_id",
+                            "user_id",
+                            "ddl_time",
+                            "status",
+                            "created_at",
+                            "updated_at",
+                            "archived_at",
+                        ],
+                        select(
+                            Todo.id,
+                            Todo.remind_time,
+                            Todo.template_id,
+                            Todo.user_id,
+                            Todo.ddl_time,
+                            Todo.status,
+                            Todo.created_at,
+                            Todo.updated_at,
+                            literal(current_time, DateTime),
+                        ).where(Todo.id.in_(todo_ids)),
+                    )
+                )
+                session.execute(delete(Todo).where(Todo.id.in_(todo_ids)))
+                archived_count += len(todo_ids)
+                self.logger.info(f"[Archive] Archived {len(todo_ids)} finished todo.")
+
+        return archived_count
+
     def check_todo_exists(
         self, session, user_id: str, template_id: int, remind_time: datetime
     ) -> bool:
@@ -363,9 +1118,9 @@ class Bulletin:
         return session.execute(stmt).first() is not None
 
     def process_templates_in_session(
-        self, session, current_time: datetime, template_processor
+        self, session, current_time: datetime, template_processor, templates=None
     ):
-        """Process all active templates within a single session.
+        """Process templates within a single session.
 
         This method allows the caller to provide a callback function to process each template,
         enabling complex operations (like scheduling) to be done atomically.
@@ -375,15 +1130,17 @@ class Bulletin:
             current_time: Current timestamp for processing
             template_processor: Callable that takes (session, template, current_time)
                               and returns a dict with 'created' (bool) and optional 'message' (str)
+            templates: Templates to process, defaults to all active templates
 
         Returns:
             Dict with 'created_count' and 'results' list
         """
-        active_templates = self.get_active_templates(session)
+        if templates is None:
+            templates = self.get_active_templates(session)
         created_count = 0
         results = []
 
-        for template in active_templates:
+        for template in templates:
             try:
                 result = template_processor(session, template, current_time)
                 if result.get("created", False):
@@ -399,72 +1156,89 @@ class Bulletin:
 
         return {"created_count": created_count, "results": results}
 
-    def schedule_todos(self, current_time: datetime | str) -> int:
-        """Schedule todos based on active templates using cron expressions.
+    def schedule_todos(
+        self, current_time: datetime | str, lookahead: timedelta = DEFAULT_LOOKAHEAD
+    ) -> int:
+        """Schedule todos for templates that fire within the lookahead window.
+
+        Only templates whose next_fire_at falls before `current_time + lookahead`
+        are loaded, so the cost of a pass depends on how many templates are due,
+        not on how many exist.
 
         Args:
             current_time: Current timestamp for scheduling
+            lookahead: Width of the scheduling window, should not be shorter
+                than the interval between two engine passes
 
         Returns:
             Number of todos created
         """
         if isinstance(current_time, str):
             current_time = datetime.fromisoformat(current_time)
+        horizon = current_time + lookahead
+
+        self.logger.info(f"[SCHEDULER] running at {current_time}, horizon {horizon}")
 
-        self.logger.info(f"[SCHEDULER] running at {current_time}")
+        # templates sharing a cron expression and next fire time are evaluated once
+        fire_times_memo = {}
 
         def process_template(session, template, current_time):
             user_id = template.user_id
             template_id = template.id
-            cron = template.cron
-            ddl_offset = template.ddl_offset
             content = template.content
-            run_once = template.run_once
 
-            # Use croniter to find the next time a todo should be scheduled
-            cron_iter = croniter(cron, current_time)
-            next_time = cron_iter.get_next(datetime)
-
-            # Check if a todo already exists for this user/template/time
-            if self.check_todo_exists(session, user_id, template_id, next_time):
-                return {"created": False, "reason": "already_exists"}
-
-            self.logger.info(
-                f"[Scheduler] CREATING: Task for {user_id} ({content}) at {next_time}"
-            )
-
-            todo_id = self.create_todo(
-                session,
-                user_id,
-                template_id,
-                ddl_offset,
-                remind_time=next_time,
-                create_time=current_time,
+            # a cron that never fires raises here, only this template is skipped
+            fire_times = self.advance_fire_times(
+                template, current_time, horizon, fire_times_memo
             )
+            new_todos = []
+            for fire_time in fire_times:
+                self.logger.info(
+                    f"[Scheduler] CREATING: Task for {user_id} ({content}) at {fire_time}"
+                )
+                new_todos.append(
+                    {
+                        "template_id": template_id,
+                        "user_id": user_id,
+                        "ddl_offset_seconds": self._offset_seconds(template),
+                        "remind_time": fire_time,
+                    }
+                )
 
-            self.logger.info(
-                f"[Scheduler] Created todo ID {todo_id} for user {user_id}"
-            )
+            if not new_todos:
+                return {"created": False, "reason": "not_due"}
 
-            if run_once:
+            if template.run_once:
                 self.logger.info(
                     f"[Scheduler] Disabling one-time template {template_id} for {user_id}"
                 )
                 template.is_active = False
 
-            return {"created": True, "todo_id": todo_id}
+            return {"created": True, "todos": new_todos}
 
         try:
             with self.run_in_session() as session:
+                due_templates = self.get_due_templates(session, horizon)
                 result = self.process_templates_in_session(
-                    session, current_time, process_template
+                    session, current_time, process_template, templates=due_templates
                 )
-                created_count = result["created_count"]
+                new_todos = [
+                    todo for r in result["results"] for todo in r.get("todos", [])
+                ]
+                # todos that already exist are skipped by the unique index
+                todo_ids = self.create_todos(session, new_todos, current_time)
+                created_count = len(todo_ids)
+                self.advance_watermark(session, horizon)
+                if created_count < len(new_todos):
+                    self.logger.info(
+                        f"[Scheduler] Skipped {len(new_todos) - created_count} existing todo."
+                    )
 
             if created_count == 0:
                 self.logger.info("[Scheduler] No new todo to schedule at this time.")
             else:
                 self.logger.info(f"[Scheduler] Created {created_count} new todo.")
+                self.logger.debug(f"[Scheduler] Created todo IDs: {todo_ids}")
 
             return created_count
 
@@ -472,81 +1246,119 @@ class Bulletin:
             self.logger.error(f"[Scheduler] DB ERROR: {e}")
             raise
 
-    def get_todos(self, query_date: date | str = None):
-        """get todos for a specific date (YYYY-MM-DD) or all if None"""
+    def get_todos(
+        self, query_date: date | str = None, open_only: bool = False
+    ) -> List[TodoRow]:
+        """get todos for a specific date (YYYY-MM-DD) or all if None
+
+        With `open_only`, only pending and escalated todos of that date are
+        returned, from the partial index that leaves out finished history.
+        """
         if query_date and isinstance(query_date, str):
             query_date = date.fromisoformat(query_date)
         self.logger.info(f"[QUERY] Getting todos for reminder date: {query_date}")
-        with self.vault.session_scope() as session:
-            if query_date:
-                rows = session.execute(
-                    select(Todo, TodoTemplate)
-                    .join(TodoTemplate, Todo.template_id == TodoTemplate.id)
-                    .where(func.cast(Todo.remind_time, Date) == query_date)
-                    .order_by(Todo.remind_time)
-                ).all()
-                result = [
-                    {
-                        "todo_id": td.id,
-                        "template_id": tpl.id,
-                        "content": tpl.content,
-                        "user_id": td.user_id,
-                        "status": td.status.value,
-                        "remind_time": td.remind_time,
-                        "ddl_time": td.ddl_time,
-                    }
-                    for td, tpl in rows
-                ]
-                return result
-            else:
-                rows = session.execute(
-                    select(Todo, TodoTemplate)
-                    .join(TodoTemplate, Todo.template_id == TodoTemplate.id)
-                    .order_by(Todo.remind_time)
-                ).all()
-                result = [
-                    {
-                        "todo_id": td.id,
-                        "template_id": tpl.id,
-                        "content": tpl.content,
-                        "user_id": td.user_id,
-                        "remind_time": td.remind_time,
-                        "ddl_time": td.ddl_time,
-                        "status": td.status.value,
-                        "created_at": td.created_at,
-                        "updated_at": td.updated_at,
-                    }
-                    for td, tpl in rows
-                ]
-                return result
+        stmt = _select_todo_rows().order_by(Todo.remind_time)
+        if query_date:
+            # half-open range on the bare column, so idx_todos_remind_id is used
+            day_start = datetime.combine(query_date, time.min)
+            stmt = stmt.where(
+                Todo.remind_time >= day_start,
+                Todo.remind_time < day_start + timedelta(days=1),
+            )
+            if open_only:
+                stmt = stmt.where(_is_open())
+        with self.vault.read_scope() as session:
+            return [_todo_row(row) for row in session.execute(stmt)]
 
-    def get_todo(self, todo_id: int):
+    def get_todos_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: str | None = None,
+        before: str | None = None,
+        statuses=None,
+        user_id: str | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ):
+        """
+        One page of todos in (remind_time, todo_id) order, keyset paginated.
+
+        The page starts right after the `after` cursor, or ends right before the
+        `before` cursor, so paging reads on from idx_todos_remind_id instead of
+        skipping OFFSET rows. Filters are applied in SQL: `statuses` (values
+        such as 'pending'), `user_id` and the half-open range [start, end) on
+        remind_time.
+
+        Returns:
+            dict with the page's "todos" and the "next_cursor"/"prev_cursor" to
+            pass as `after`/`before` for the neighbouring pages, None at an end
+        """
+        if after and before:
+            raise ValueError("Only one of after and before can be given")
+        if isinstance(start, str):
+            start = datetime.fromisoformat(start)
+        if isinstance(end, str):
+            end = datetime.fromisoformat(end)
+        stmt = _select_todo_rows()
+        if statuses:
+            stmt = stmt.where(Todo.status.in_([TodoStatus(s) for s in statuses]))
+        if user_id:
+            stmt = stmt.where(Todo.user_id == user_id)
+        if start:
+            stmt = stmt.where(Todo.remind_time >= start)
+        if end:
+            stmt = stmt.where(Todo.remind_time < end)
+
+        key = tuple_(Todo.remind_time, Todo.id)
+        if before:
+            # walk backwards from the cursor, the page is reversed below
+            stmt = stmt.where(key < decode_cursor(before)).order_by(
+                Todo.remind_time.desc(), Todo.id.desc()
+            )
+        else:
+            if after:
+                stmt = stmt.where(key > decode_cursor(after))
+            stmt = stmt.order_by(Todo.remind_time, Todo.id)
+        # one more row tells whether there is a page beyond this one
+        stmt = stmt.limit(limit + 1)
+
+        self.logger.info(
+            f"[QUERY] Getting a page of {limit} todos after={after} before={before}"
+        )
+        with self.vault.read_scope() as session:
+            rows = session.execute(stmt).all()
+        has_more = len(rows) > limit
+        todos = [_todo_row(row) for row in rows[:limit]]
+
+        if before:
+            todos.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = after is not None, has_more
+        return {
+            "todos": todos,
+            "next_cursor": encode_cursor(todos[-1]) if todos and has_next else None,
+            "prev_cursor": encode_cursor(todos[0]) if todos and has_prev else None,
+        }
+
+    def get_todo(self, todo_id: int) -> TodoRow | None:
         """get a specific todo by todo_id"""
         self.logger.info(f"[QUERY] Getting Todo {todo_id}")
-        with self.vault.session_scope() as session:
+        with self.vault.read_scope() as session:
             row = session.execute(
-                select(Todo, TodoTemplate)
-                .join(TodoTemplate, Todo.template_id == TodoTemplate.id)
-                .where(Todo.id == todo_id)
+                _select_todo_rows().where(Todo.id == todo_id)
             ).one_or_none()
             if not row:
-                return None
-            td, tpl = row
-            return {
-                "todo_id": td.id,
-                "content": tpl.content,
-                "user_id": td.user_id,
-                "remind_time": td.remind_time,
-                "ddl_time": td.ddl_time,
-                "status": td.status.value,
-                "created_at": td.created_at,
-                "updated_at": td.updated_at,
-            }
+                # finished todos move to the archive after a while
+                row = session.execute(
+                    _select_todo_rows(TodoArchive).where(TodoArchive.id == todo_id)
+                ).one_or_none()
+            return _todo_row(row) if row else None
 
     def get_todo_log(self, todo_id: int):
         """get the status change log for a specific todo"""
         self.logger.info(f"[QUERY] Getting status log for Todo {todo_id}")
-        with self.vault.session_scope() as session:
+        with self.vault.read_scope() as session:
             logs = (
                 session.execute(
                     select(TodoStatusLog)
@@ -556,6 +1368,17 @@ class Bulletin:
                 .scalars()
                 .all()
             )
+            if not logs:
+                # a todo and its logs are archived together
+                logs = (
+                    session.execute(
+                        select(TodoStatusLogArchive)
+                        .where(TodoStatusLogArchive.todo_id == todo_id)
+                        .order_by(TodoStatusLogArchive.changed_at)
+                    )
+                    .scalars()
+                    .all()
+                )
             return [
                 {
                     "log_id": l.id,
@@ -569,3 +1392,52 @@ class Bulletin:
                 }
                 for l in logs
             ]
+
+    def get_sent_notifications(self, query_date: date | str):
+        """(todo_id, kind) of the reminders already sent for todos of a date"""
+        if isinstance(query_date, str):
+            query_date = date.fromisoformat(query_date)
+        day_start = datetime.combine(query_date, time.min)
+        # from the primary, patrol must not miss a reminder it just recorded
+        with self.vault.session_scope() as session:
+            rows = session.execute(
+                select(NotificationSent.todo_id, NotificationSent.kind)
+                .join(Todo, Todo.id == NotificationSent.todo_id)
+                .where(
+                    Todo.remind_time >= day_start,
+                    Todo.remind_time < day_start + timedelta(days=1),
+                )
+            )
+            return {(row.todo_id, row.kind) for row in rows}
+
+    def record_notifications(self, notifications, sent_at: datetime):
+        """Record sent reminders, `notifications` is an iterable of (todo_id, kind)"""
+        rows = [
+            {"todo_id": todo_id, "kind": kind, "sent_at": sent_at}
+            for todo_id, kind in notifications
+        ]
+        if not rows:
+            return
+        with self.vault.session_scope() as session:
+            for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                session.execute(
+                    _dialect_insert(session, NotificationSent).on_conflict_do_nothing(),
+                    rows[start : start + BULK_INSERT_CHUNK_SIZE],
+                )
+
+    def get_last_summary_time(self) -> datetime | None:
+        """When the last end-of-day summary was sent, None if never"""
+        with self.vault.session_scope() as session:
+            state = session.get(EngineState, SUMMARY_SENT)
+            return state.value if state is not None else None
+
+    def record_summary(self, sent_at: datetime):
+        with self.vault.session_scope() as session:
+            stmt = _dialect_insert(session, EngineState).values(
+                name=SUMMARY_SENT, value=sent_at
+            )
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["name"], set_={"value": stmt.excluded.value}
+                )
+            )
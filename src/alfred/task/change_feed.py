@@ -0,0 +1,117 @@
+"""
+Changes made by any process, delivered as in-process events.
+
+On Postgres the triggers in vault.models pg_notify every write to the templates
+and todos in the writing transaction, so a notification arrives once the write
+is committed and never for a rolled back one. ChangeFeed LISTENs on a dedicated
+connection and republishes them through `events`, subscribers react within
+milliseconds to writes of other processes too. SQLite has no such feed, the
+periodic passes stay the way changes are picked up there.
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+
+from alfred.task import events
+from alfred.task.vault import get_vault
+from alfred.task.vault.models import CHANGE_CHANNEL
+
+
+class ChangeFeed:
+    def __init__(
+        self,
+        vault=None,
+        poll_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.vault = vault or get_vault()
+        # how often the listener checks for stop() while the channel is quiet
+        self.poll_seconds = poll_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._thread = None
+
+    @property
+    def supported(self) -> bool:
+        return self.vault.engine.dialect.name == "postgresql"
+
+    def dispatch(self, payload: str):
+        """Publish the event of one notification payload"""
+        change = json.loads(payload)
+        if change["table"] == "todo_templates":
+            events.publish(events.TEMPLATE_CHANGED, template_id=change["template_id"])
+        elif change["table"] == "todos":
+            events.publish(
+                events.TODOS_CHANGED,
+                op=change["op"],
+                count=change["count"],
+                todo_ids=change["todo_ids"] or [],
+                remind_times=[
+                    datetime.fromisoformat(t) for t in change["remind_times"] or []
+                ],
+            )
+        else:
+            self.logger.warning(f"[ChangeFeed] Unknown change: {payload}")
+
+    def _connect(self):
+        import psycopg
+
+        engine = self.vault.engine
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        # outside the pool, the connection is held for as long as the feed runs
+        conn = psycopg.connect(*cargs, **cparams, autocommit=True)
+        conn.execute(f"LISTEN {CHANGE_CHANNEL}")
+        return conn
+
+    def _listen(self, conn):
+        while not self._stop.is_set():
+            for notify in conn.notifies(timeout=self.poll_seconds):
+                try:
+                    self.dispatch(notify.payload)
+                except Exception as e:
+                    self.logger.exception(
+                        f"[ChangeFeed] Bad notification {notify.payload}: {e}"
+                    )
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with self._connect() as conn:
+                    self.logger.info(f"[ChangeFeed] Listening on {CHANGE_CHANNEL}")
+                    self._listening.set()
+                    backoff = 1.0
+                    self._listen(conn)
+            except Exception as e:
+                self._listening.clear()
+                # notifications sent while disconnected are lost, the periodic
+                # passes catch up on them
+                self.logger.warning(
+                    f"[ChangeFeed] Connection lost: {e}, retrying in {backoff:.0f}s"
+                )
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+        self._listening.clear()
+
+    def wait_listening(self, timeout: float | None = None) -> bool:
+        return self._listening.wait(timeout)
+
+    def start(self) -> bool:
+        """Start listening, False if the database can't notify"""
+        if not self.supported:
+            self.logger.info("[ChangeFeed] Not on Postgres, changes are polled.")
+            return False
+        self._thread = threading.Thread(
+            target=self._run, name="alfred-change-feed", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
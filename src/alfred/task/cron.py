@@ -0,0 +1,181 @@
+"""
+Cron evaluation shared by the engine passes.
+
+Most templates share a handful of expressions, parsing is done once per
+distinct cron string and kept in a bounded LRU cache.
+
+Expressions in the plain 5-field syntax (lists, ranges, steps, names, `?` and
+the `DOW#N` form produced by the Slack modal) are compiled into bitmasks, so
+checking whether they fire at a given minute is a few bit tests. Anything else
+(`L`, `W`, seconds or year fields, a day of month next to `DOW#N`, ...) falls
+back to croniter.
+"""
+
+import copy
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+from croniter import croniter, CroniterBadDateError
+
+# distinct cron strings whose parsed form is kept
+CRON_CACHE_SIZE = 512
+# same give-up bound as croniter for expressions that never fire, e.g. `0 0 30 2 *`
+MAX_YEARS_BETWEEN_MATCHES = 50
+
+
+def _mask(values) -> int:
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+class CompiledCron:
+    """Bitmask form of a 5-field cron expression.
+
+    Bit `n` of each mask is set if the field accepts value `n`. Day of week
+    counts from Sunday = 0 like cron. `nth_weekdays[dow]` has bit `n` set for
+    `DOW#n`, 0 means any occurrence of that weekday.
+    """
+
+    __slots__ = (
+        "minutes",
+        "hours",
+        "days",
+        "months",
+        "weekdays",
+        "nth_weekdays",
+        "any_day",
+        "any_weekday",
+    )
+
+    def __init__(self, expanded, nth_weekday_of_month):
+        minutes, hours, days, months, weekdays = expanded
+        self.minutes = _mask(range(60) if minutes == ["*"] else minutes)
+        self.hours = _mask(range(24) if hours == ["*"] else hours)
+        self.any_day = days == ["*"]
+        self.days = _mask(range(1, 32) if self.any_day else days)
+        self.months = _mask(range(1, 13) if months == ["*"] else months)
+        self.any_weekday = weekdays == ["*"]
+        self.weekdays = _mask(range(7) if self.any_weekday else weekdays)
+        self.nth_weekdays = [
+            _mask(nth_weekday_of_month.get(dow, ())) for dow in range(7)
+        ]
+
+    @classmethod
+    def compile(cls, cron: str) -> "CompiledCron | None":
+        """Compile `cron`, None if it uses syntax only croniter handles"""
+        expanded, nth_weekday_of_month = croniter.expand(cron)
+        if len(expanded) != 5 or any("l" in field for field in expanded):
+            return None
+        # `15W` expands like `15`, the nearest weekday rule is lost
+        if "w" in cron.split()[2].lower():
+            return None
+        # croniter ignores a restricted day of month next to `DOW#N`, keep its rules
+        if nth_weekday_of_month and expanded[2] != ["*"]:
+            return None
+        return cls(expanded, nth_weekday_of_month)
+
+    def _day_matches(self, day: date) -> bool:
+        day_ok = self.days >> day.day & 1
+        dow = day.isoweekday() % 7
+        weekday_ok = self.weekdays >> dow & 1
+        if weekday_ok and self.nth_weekdays[dow]:
+            weekday_ok = self.nth_weekdays[dow] >> ((day.day - 1) // 7 + 1) & 1
+        if self.any_weekday:
+            return bool(day_ok)
+        if self.any_day:
+            return bool(weekday_ok)
+        # both restricted, cron fires on either
+        return bool(day_ok or weekday_ok)
+
+    def fires_at(self, t: datetime) -> bool:
+        """Whether the expression fires at the minute of `t`"""
+        return bool(
+            self.minutes >> t.minute & 1
+            and self.hours >> t.hour & 1
+            and self.months >> t.month & 1
+            and self._day_matches(t.date())
+        )
+
+    def _time_from(self, hour: int, minute: int) -> time | None:
+        """First fire time of a matching day at or after hour:minute"""
+        for h in range(hour, 24):
+            if not self.hours >> h & 1:
+                continue
+            minutes = self.minutes >> minute << minute if h == hour else self.minutes
+            if minutes:
+                return time(h, (minutes & -minutes).bit_length() - 1)
+        return None
+
+    def next_after(self, start_time: datetime) -> datetime:
+        """First fire time strictly after `start_time`, like croniter.get_next"""
+        t = start_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day, hour, minute = t.date(), t.hour, t.minute
+        limit = date(day.year + MAX_YEARS_BETWEEN_MATCHES, 1, 1)
+        while day < limit:
+            if not self.months >> day.month & 1:
+                # skip the whole month
+                day = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+                hour = minute = 0
+                continue
+            if self._day_matches(day):
+                fire_time = self._time_from(hour, minute)
+                if fire_time is not None:
+                    return datetime.combine(day, fire_time)
+            day += timedelta(days=1)
+            hour = minute = 0
+        raise CroniterBadDateError(f"no fire time of {self!r} before {limit}")
+
+
+@lru_cache(maxsize=CRON_CACHE_SIZE)
+def _parsed(cron: str) -> croniter:
+    return croniter(cron, datetime(2000, 1, 1))
+
+
+@lru_cache(maxsize=CRON_CACHE_SIZE)
+def compile_cron(cron: str) -> CompiledCron | None:
+    """Cached CompiledCron of `cron`, None if it needs croniter"""
+    return CompiledCron.compile(cron)
+
+
+def cron_iter(cron: str, start_time: datetime) -> croniter:
+    """croniter over `cron` starting after `start_time`, reusing the parsed expression"""
+    # get_next only moves the cursor, the expanded fields are shared read-only
+    it = copy.copy(_parsed(cron))
+    it.set_current(start_time, force=True)
+    return it
+
+
+def fire_times_between(
+    cron: str, first: datetime, until: datetime, run_once: bool = False
+) -> tuple[list[datetime], datetime]:
+    """Fire times of `cron` in [first, until], `first` must be a fire time.
+
+    Returns:
+        (fire times in ascending order, the next fire time after them),
+        a run_once template stops after its first fire time
+    """
+    compiled = compile_cron(cron)
+    if compiled is not None:
+        get_next = compiled.next_after
+    else:
+        it = cron_iter(cron, first)
+        get_next = lambda _: it.get_next(datetime)  # noqa: E731
+
+    fire_times = []
+    fire_time = first
+    while fire_time <= until:
+        fire_times.append(fire_time)
+        if run_once:
+            break
+        fire_time = get_next(fire_time)
+    return fire_times, fire_time
+
+
+def next_fire_time(cron: str, start_time: datetime) -> datetime:
+    """First fire time of `cron` after `start_time`"""
+    compiled = compile_cron(cron)
+    if compiled is not None:
+        return compiled.next_after(start_time)
+    return cron_iter(cron, start_time).get_next(datetime)
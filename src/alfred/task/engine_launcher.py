@@ -1,29 +1,52 @@
-from datetime import datetime
+from datetime import timedelta
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor
 
-from .task_engine import run_scheduler
+from alfred.task.vault import get_vault
+from alfred.utils import clock
+from .change_feed import ChangeFeed
+from .event_engine import EventEngine
+from .task_engine import run_scheduler, run_archiver
 
 logger = logging.getLogger(__name__)
 
-def task_engine_job():
+def task_engine_job(lookahead: timedelta, max_lookback: timedelta):
     try:
-        current_time = datetime.now()
-        run_scheduler(current_time)
+        current_time = clock.now()
+        run_scheduler(current_time, lookahead, max_lookback)
+        logger.debug(f"[Vault] Pool stats: {get_vault().pool_stats()}")
     except Exception as e:
         logger.exception(f"Error in task engine job: {e}")
 
 
-def launch_engine_scheduler(seconds: int = 60) -> bool:
+def archive_job(max_age: timedelta):
+    try:
+        run_archiver(clock.now(), max_age)
+    except Exception as e:
+        logger.exception(f"Error in archive job: {e}")
+
+
+def launch_engine_scheduler(
+    seconds: int = 60, max_lookback_hours: float = 24, horizon_hours: float = 0
+) -> bool:
     # only 1 worker thread
     executors = {"default": ThreadPoolExecutor(max_workers=1)}
 
     scheduler = BackgroundScheduler(executors=executors)
+    # each pass must cover the gap until the next one, and at least one cron minute,
+    # a wider horizon materializes todos ahead so the engine can run less often
+    lookahead = max(
+        timedelta(seconds=max(seconds, 60)), timedelta(hours=horizon_hours)
+    )
 
     try:
         scheduler.add_job(
             func=task_engine_job,
+            kwargs={
+                "lookahead": lookahead,
+                "max_lookback": timedelta(hours=max_lookback_hours),
+            },
             trigger="interval",
             seconds=seconds,  # default every 60 seconds, if in testing can set to smaller value
             id="task_engine_job",
@@ -37,3 +60,72 @@ def launch_engine_scheduler(seconds: int = 60) -> bool:
         logger.exception(f"Error starting scheduler: {e}")
         scheduler.shutdown()
         return False
+
+
+def launch_event_engine(
+    max_lookback_hours: float = 24, horizon_hours: float = 0
+) -> bool:
+    """Start the engine that sleeps until the next template fires instead of polling."""
+    engine = EventEngine(
+        lookahead=max(timedelta(seconds=60), timedelta(hours=horizon_hours)),
+        max_lookback=timedelta(hours=max_lookback_hours),
+    )
+    try:
+        engine.start()
+        return True
+    except Exception as e:
+        logger.exception(f"Error starting event engine: {e}")
+        return False
+
+
+def launch_engine(scheduler_config: dict) -> bool:
+    """Start the engine configured by the `scheduler` section of config.yaml."""
+    backfill_max_lookback = scheduler_config.get("backfill_max_lookback_hours", 24)
+    engine_horizon = scheduler_config.get("engine_horizon_hours", 0)
+    if scheduler_config.get("engine_mode", "interval") == "event":
+        return launch_event_engine(
+            max_lookback_hours=backfill_max_lookback, horizon_hours=engine_horizon
+        )
+    return launch_engine_scheduler(
+        seconds=scheduler_config.get("engine_interval_seconds", 60),
+        max_lookback_hours=backfill_max_lookback,
+        horizon_hours=engine_horizon,
+    )
+
+
+def launch_change_feed() -> bool:
+    """Publish the changes of other processes as events, Postgres only."""
+    try:
+        return ChangeFeed().start()
+    except Exception as e:
+        logger.exception(f"Error starting change feed: {e}")
+        return False
+
+
+def launch_archiver(archive_config: dict) -> bool:
+    """Periodically archive finished todos, configured by the `archive` section of config.yaml."""
+    max_age_days = archive_config.get("max_age_days", 0)
+    if not max_age_days:
+        logger.info("Archiving finished todos is disabled.")
+        return False
+
+    # only 1 worker thread
+    executors = {"default": ThreadPoolExecutor(max_workers=1)}
+    scheduler = BackgroundScheduler(executors=executors)
+    try:
+        scheduler.add_job(
+            func=archive_job,
+            kwargs={"max_age": timedelta(days=max_age_days)},
+            trigger="interval",
+            hours=archive_config.get("interval_hours", 24),
+            id="archive_job",
+            replace_existing=True,
+            # first run right away, then every interval
+            next_run_time=clock.now(),
+        )
+        scheduler.start()
+        return True
+    except Exception as e:
+        logger.exception(f"Error starting archive scheduler: {e}")
+        scheduler.shutdown()
+        return False
@@ -0,0 +1,142 @@
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from alfred.task import events
+from alfred.utils import clock
+from .bulletin import Bulletin, DEFAULT_LOOKAHEAD, DEFAULT_MAX_LOOKBACK
+from .task_engine import run_scheduler
+
+
+class EventEngine:
+    """
+    Task engine that sleeps until the next template fires instead of polling.
+
+    Keeps a min-heap of (next_fire_at, template_id) of active templates. It wakes
+    `lookahead` before the earliest one, or as soon as a template is added or
+    (de)activated through Bulletin, runs one engine pass and refreshes the heap
+    entries of the templates it touched. On Postgres the change feed delivers
+    the changes of other processes the same way.
+    """
+
+    def __init__(
+        self,
+        lookahead: timedelta = DEFAULT_LOOKAHEAD,
+        max_lookback: timedelta = DEFAULT_MAX_LOOKBACK,
+        resync_interval: timedelta = timedelta(minutes=10),
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.bulletin = Bulletin()
+        self.lookahead = lookahead
+        self.max_lookback = max_lookback
+        # without the change feed (SQLite) templates changed by other processes
+        # are only seen on a full reload
+        self.resync_interval = resync_interval
+
+        self._heap = []
+        # template_id -> next_fire_at, heap entries that disagree are stale
+        self._next_fire = {}
+        self._changed = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._last_resync = None
+        self._thread = None
+
+    def on_template_changed(self, template_id: int):
+        """Bulletin callback, wake the engine to reschedule `template_id`"""
+        with self._lock:
+            self._changed.add(template_id)
+        self._wakeup.set()
+
+    def _push(self, template_id: int, next_fire_at: datetime | None, now: datetime):
+        # not scheduled yet, the next pass seeds it
+        next_fire_at = next_fire_at or now
+        self._next_fire[template_id] = next_fire_at
+        heapq.heappush(self._heap, (next_fire_at, template_id))
+
+    def _refresh(self, template_ids, now: datetime):
+        """Reload heap entries, all active templates if `template_ids` is None"""
+        with self.bulletin.run_in_session() as session:
+            rows = self.bulletin.get_next_fire_times(session, template_ids)
+        if template_ids is None:
+            self._heap = []
+            self._next_fire = {}
+            self._last_resync = now
+        else:
+            # deactivated templates are not returned, drop them
+            for template_id in template_ids:
+                self._next_fire.pop(template_id, None)
+        for template_id, next_fire_at in rows:
+            self._push(template_id, next_fire_at, now)
+
+    def _pop_due(self, horizon: datetime):
+        due = set()
+        while self._heap and self._heap[0][0] <= horizon:
+            next_fire_at, template_id = heapq.heappop(self._heap)
+            if self._next_fire.get(template_id) == next_fire_at:
+                due.add(template_id)
+        return due
+
+    def step(self, now: datetime) -> float:
+        """Run one engine pass if anything is due.
+
+        Returns:
+            Seconds to sleep until the next template is due
+        """
+        if self._last_resync is None or now - self._last_resync >= self.resync_interval:
+            self._refresh(None, now)
+
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        if changed:
+            self._refresh(changed, now)
+
+        due = self._pop_due(now + self.lookahead)
+        if due:
+            self.logger.info(f"[EventEngine] {len(due)} templates due at {now}")
+            try:
+                run_scheduler(now, self.lookahead, self.max_lookback)
+            finally:
+                # popped entries must go back even if the pass failed, or they
+                # would wait for the next full resync
+                self._refresh(due, now)
+
+        # drop entries of rescheduled or deactivated templates
+        while self._heap and self._next_fire.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+        wake_at = self._last_resync + self.resync_interval
+        if self._heap:
+            next_due = self._heap[0][0] - self.lookahead
+            if next_due <= now:
+                # the pass didn't advance it, e.g. claimed by another engine, retry later
+                next_due = now + self.lookahead
+            wake_at = min(wake_at, next_due)
+        return max((wake_at - now).total_seconds(), 0)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                timeout = self.step(clock.now())
+            except Exception as e:
+                self.logger.exception(f"Error in event engine: {e}")
+                timeout = self.lookahead.total_seconds()
+            self.logger.debug(f"[EventEngine] sleeping {timeout:.3f}s")
+            self._wakeup.wait(timeout)
+
+    def start(self):
+        events.subscribe(events.TEMPLATE_CHANGED, self.on_template_changed)
+        self._thread = threading.Thread(
+            target=self._run, name="alfred-event-engine", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        events.unsubscribe(events.TEMPLATE_CHANGED, self.on_template_changed)
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
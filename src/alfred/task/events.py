@@ -0,0 +1,45 @@
+"""
+In-process notifications about changes made through Bulletin.
+
+Bulletin publishes after a change is committed, subscribers such as the event
+driven engine react without polling the database. On Postgres the change feed
+(alfred.task.change_feed) also publishes the changes made by other processes.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# payload: template_id
+TEMPLATE_CHANGED = "template_changed"
+# payload: op ("INSERT"/"UPDATE"), count, todo_ids, remind_times
+# the ids and times are capped at 100, count is the number of changed todos
+TODOS_CHANGED = "todos_changed"
+
+_lock = threading.Lock()
+_subscribers = defaultdict(list)
+
+
+def subscribe(topic: str, callback):
+    """Call `callback(**payload)` every time `topic` is published"""
+    with _lock:
+        _subscribers[topic].append(callback)
+
+
+def unsubscribe(topic: str, callback):
+    with _lock:
+        if callback in _subscribers[topic]:
+            _subscribers[topic].remove(callback)
+
+
+def publish(topic: str, **payload):
+    """Notify subscribers of `topic`, a failing subscriber doesn't affect the others"""
+    with _lock:
+        callbacks = list(_subscribers[topic])
+    for callback in callbacks:
+        try:
+            callback(**payload)
+        except Exception as e:
+            logger.exception(f"Error in subscriber of {topic}: {e}")
@@ -0,0 +1,59 @@
+"""
+Rows returned by the Bulletin read paths.
+
+Named tuples of just the selected columns, built straight from the result
+rows without going through ORM entities and the identity map. They read like
+the dicts they replace (row["user_id"], row.get("due_time", default)) as well
+as by attribute (row.user_id).
+"""
+
+from datetime import datetime
+from typing import NamedTuple
+
+
+class _DictAccess:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+    def keys(self):
+        return self._fields
+
+
+class _TodoRow(NamedTuple):
+    todo_id: int
+    template_id: int
+    content: str
+    user_id: str
+    status: str
+    remind_time: datetime
+    ddl_time: datetime
+
+
+class TodoRow(_DictAccess, _TodoRow):
+    """A todo joined with its template's content, status as its value ('pending')"""
+
+    __slots__ = ()
+
+
+class _TemplateRow(NamedTuple):
+    template_id: int
+    user_id: str
+    content: str
+    cron: str
+    ddl_offset: str
+    is_active: bool
+    run_once: bool
+    created_at: datetime
+
+
+class TemplateRow(_DictAccess, _TemplateRow):
+    __slots__ = ()
@@ -1,11 +1,22 @@
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from .bulletin import Bulletin
+from .bulletin import Bulletin, DEFAULT_LOOKAHEAD, DEFAULT_MAX_LOOKBACK
 
 _bulletin = Bulletin()
 
 
-def run_scheduler(current_time: datetime | str):
+def run_scheduler(
+    current_time: datetime | str,
+    lookahead: timedelta = DEFAULT_LOOKAHEAD,
+    max_lookback: timedelta = DEFAULT_MAX_LOOKBACK,
+):
     """Scheduler to create todos based on active templates."""
-    _bulletin.schedule_todos(current_time)
+    # catch up on fire times missed while the engine was down, then schedule ahead
+    _bulletin.backfill_todos(current_time, max_lookback)
+    _bulletin.schedule_todos(current_time, lookahead)
+
+
+def run_archiver(current_time: datetime | str, max_age: timedelta):
+    """Move finished todos older than `max_age` out of the hot tables."""
+    _bulletin.archive_todos(current_time, max_age)
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy import (
+    DDL,
     String,
     Integer,
     Boolean,
@@ -10,7 +11,9 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    event,
     func,
+    text,
     Enum as SAEnum,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -29,6 +32,13 @@ class TodoStatus(str, enum.Enum):
     ESCALATED = "escalated"
 
 
+# 未完成的状态, 部分索引和查询条件必须一致才能使用索引
+OPEN_STATUSES = (TodoStatus.PENDING, TodoStatus.ESCALATED)
+OPEN_STATUS_PREDICATE = "status IN ({})".format(
+    ", ".join(f"'{s.name}'" for s in OPEN_STATUSES)
+)
+
+
 # ---------------------------------------------------------
 # Table 1: 任务模板 (Cron)
 # ---------------------------------------------------------
@@ -50,6 +60,10 @@ class TodoTemplate(Base):
     # 对应: ddl_offset TEXT NOT NULL
     ddl_offset: Mapped[str] = mapped_column(String(50), nullable=False)
 
+    # ddl_offset 解析后的秒数, add_template 时校验并写入, engine 直接用于计算 ddl_time
+    # NULL 只出现在加列之前的旧模板, engine 第一次调度时补齐
+    ddl_offset_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
     # 对应: run_once INTEGER DEFAULT 0 (用 Boolean 映射)
     run_once: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
@@ -61,11 +75,24 @@ class TodoTemplate(Base):
         DateTime, server_default=func.now(), nullable=True
     )
 
+    # 下一次触发时间: 由 engine 首次调度时计算, 触发后才向后推进
+    # NULL 表示尚未调度过 (新模板或重新启用的模板)
+    next_fire_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
     # 【ORM 关系】: 一个模板可以生成多个 Todo
     todos: Mapped[List["Todo"]] = relationship(back_populates="template")
 
     # 【索引】: 对应 CREATE INDEX idx_templates_user_active
-    __table_args__ = (Index("idx_templates_user_active", "user_id", "is_active"),)
+    __table_args__ = (
+        Index("idx_templates_user_active", "user_id", "is_active"),
+        # engine 每个 tick 只查询到期的模板, 部分索引只包含启用的模板
+        Index(
+            "idx_templates_active_next_fire",
+            "next_fire_at",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
 
 # ---------------------------------------------------------
@@ -108,6 +135,25 @@ class Todo(Base):
     __table_args__ = (
         Index("idx_todos_user_status", "user_id", "status"),
         Index("idx_todos_status_ddl", "status", "ddl_time"),
+        # patrol 和每日总结按 remind_time 的日期范围查询
+        # (remind_time, todo_id) 也是 list 分页的游标顺序, 翻页不需要排序
+        Index("idx_todos_remind_id", "remind_time", "todo_id"),
+        # patrol 只关心未完成的 todo, 部分索引不包含已完成/撤销的历史数据
+        # 注意: 数据库里存的是枚举名 (PENDING), 不是值 (pending)
+        Index(
+            "idx_todos_open_remind",
+            "remind_time",
+            postgresql_where=text(OPEN_STATUS_PREDICATE),
+            sqlite_where=text(OPEN_STATUS_PREDICATE),
+        ),
+        # 同一模板同一用户同一时间只有一个 todo, 重复插入由数据库拒绝
+        Index(
+            "uq_todos_template_user_remind",
+            "template_id",
+            "user_id",
+            "remind_time",
+            unique=True,
+        ),
     )
 
 
@@ -132,4 +178,163 @@ class TodoStatusLog(Base):
     todo: Mapped["Todo"] = relationship(back_populates="logs")
 
     # 【索引】
-    __table_args__ = (Index("idx_logs_todo_id", "todo_id"),)
+    # (todo_id, changed_at): 按 todo 查询日志时不需要再排序
+    __table_args__ = (Index("idx_logs_todo_changed", "todo_id", "changed_at"),)
+
+
+# ---------------------------------------------------------
+# Table 4: engine 状态 (watermark 等)
+# ---------------------------------------------------------
+class EngineState(Base):
+    __tablename__ = "engine_state"
+
+    # 例如: "watermark" = 最近一次调度已覆盖到的时间
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    value: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+# ---------------------------------------------------------
+# Table 5: 已发送的提醒 (patrol 的去重账本)
+# ---------------------------------------------------------
+class NotificationSent(Base):
+    __tablename__ = "notifications_sent"
+
+    # 每个 todo 每种提醒 (normal / overdue) 最多发一次, 重启后也不会重发
+    todo_id: Mapped[int] = mapped_column(
+        ForeignKey("todos.todo_id"), primary_key=True
+    )
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+# ---------------------------------------------------------
+# 归档表: 已完成/撤销且超过保留期的 todo 及其日志从热表移到这里
+# Postgres 上按月分区 (remind_time / changed_at), 分区由归档任务按需创建
+# SQLite 上是普通表
+# ---------------------------------------------------------
+class TodoArchive(Base):
+    __tablename__ = "todos_archive"
+
+    # 保留原 todo_id, 不自增; 分区表的主键必须包含分区键
+    id: Mapped[int] = mapped_column(
+        "todo_id", Integer, primary_key=True, autoincrement=False
+    )
+    remind_time: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    # 模板不会被删除, 但分区表上不建外键
+    template_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    ddl_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    status: Mapped[TodoStatus] = mapped_column(SAEnum(TodoStatus), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # get_todo 按 id 回查归档
+        Index("idx_todos_archive_todo_id", "todo_id"),
+        {"postgresql_partition_by": "RANGE (remind_time)"},
+    )
+
+
+class TodoStatusLogArchive(Base):
+    __tablename__ = "todo_status_logs_archive"
+
+    id: Mapped[int] = mapped_column(
+        "log_id", Integer, primary_key=True, autoincrement=False
+    )
+    changed_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    todo_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    old_status: Mapped[Optional[TodoStatus]] = mapped_column(
+        SAEnum(TodoStatus), nullable=True
+    )
+    new_status: Mapped[TodoStatus] = mapped_column(SAEnum(TodoStatus), nullable=False)
+
+    __table_args__ = (
+        Index("idx_logs_archive_todo_changed", "todo_id", "changed_at"),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
+
+
+# ---------------------------------------------------------
+# 变更通知 (仅 Postgres): 触发器在写入的事务里 pg_notify, 事务提交后才送达
+# 监听和转换成进程内事件见 alfred.task.change_feed
+# ---------------------------------------------------------
+CHANGE_CHANNEL = "alfred_changes"
+
+# 模板: 每行一条通知. next_fire_at 每次调度都会更新, 不通知
+_TEMPLATE_NOTIFY_DDL = [
+    f"""
+CREATE OR REPLACE FUNCTION alfred_notify_template_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+        'table', TG_TABLE_NAME,
+        'op', TG_OP,
+        'template_id', NEW.template_id
+    )::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE TRIGGER trg_templates_notify
+AFTER INSERT OR UPDATE OF is_active, cron ON todo_templates
+FOR EACH ROW EXECUTE FUNCTION alfred_notify_template_changed()
+""",
+]
+
+# todo: 每条语句一条通知, 批量创建也只通知一次
+# payload 上限 8000 字节, 最多带 100 个 todo_id 和 100 个不同的 remind_time
+_TODO_NOTIFY_DDL = [
+    f"""
+CREATE OR REPLACE FUNCTION alfred_notify_todos_changed() RETURNS trigger AS $$
+DECLARE
+    changed integer;
+BEGIN
+    SELECT count(*) INTO changed FROM new_rows;
+    IF changed > 0 THEN
+        PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'count', changed,
+            'todo_ids', (
+                SELECT json_agg(todo_id)
+                FROM (SELECT todo_id FROM new_rows ORDER BY todo_id LIMIT 100) ids
+            ),
+            'remind_times', (
+                SELECT json_agg(remind_time)
+                FROM (
+                    SELECT DISTINCT remind_time FROM new_rows
+                    ORDER BY remind_time LIMIT 100
+                ) times
+            )
+        )::text);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    # 带 transition table 的触发器只能对应一种事件
+    """
+CREATE TRIGGER trg_todos_notify_insert
+AFTER INSERT ON todos REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION alfred_notify_todos_changed()
+""",
+    """
+CREATE TRIGGER trg_todos_notify_update
+AFTER UPDATE ON todos REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION alfred_notify_todos_changed()
+""",
+]
+
+for _table, _statements in (
+    (TodoTemplate.__table__, _TEMPLATE_NOTIFY_DDL),
+    (Todo.__table__, _TODO_NOTIFY_DDL),
+):
+    for _statement in _statements:
+        event.listen(
+            _table, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+        )
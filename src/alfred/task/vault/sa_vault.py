@@ -1,35 +1,166 @@
 from contextlib import contextmanager
+from contextvars import ContextVar
 import logging
+import threading
+import time
 from functools import lru_cache
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.exc import OperationalError, TimeoutError
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 
-from alfred.utils.config import get_vault_path
+from alfred.utils.config import (
+    get_vault_options,
+    get_vault_path,
+    get_vault_replica_path,
+)
 from alfred.task.vault.models import Base
 
+# set by Vault.pin_primary, per thread (and per asyncio task)
+_primary_pinned = ContextVar("primary_pinned", default=False)
+
+# engine tuning, each can be overridden under vault: in config.yaml
+DEFAULT_OPTIONS = {
+    # connection pool, both dialects
+    "pool_size": 20,
+    "max_overflow": 10,
+    "pool_timeout": 30,  # seconds to wait for a free connection
+    "pool_recycle": -1,  # seconds, -1 never recycles
+    "pool_pre_ping": True,
+    # postgres, 0 is no limit
+    "statement_timeout": 0,  # ms
+    "lock_timeout": 0,  # ms
+    # sqlite pragmas
+    "busy_timeout": 30000,  # ms
+    "cache_size": -2000,  # pages, negative is KiB
+    "mmap_size": 0,  # bytes
+    "temp_store": "DEFAULT",  # DEFAULT, FILE or MEMORY
+}
+
+# a checkout slower than this is logged with the pool stats
+SLOW_CHECKOUT_SECONDS = 1.0
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+            if wait > SLOW_CHECKOUT_SECONDS:
+                logging.getLogger(__name__).warning(
+                    f"[Vault] Waited {wait:.2f}s for a connection: {self.stats()}"
+                )
+
+    def recreate(self):
+        # pool_recycle and dispose() build a new pool, keep counting in it
+        pool = super().recreate()
+        pool.checkouts, pool.timeouts = self.checkouts, self.timeouts
+        pool.wait_total, pool.wait_max = self.wait_total, self.wait_max
+        return pool
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            checkouts, timeouts = self.checkouts, self.timeouts
+            wait_total, wait_max = self.wait_total, self.wait_max
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_avg": wait_total / checkouts * 1000 if checkouts else 0.0,
+            "wait_ms_max": wait_max * 1000,
+        }
+
 
 class Vault:
     """
     SQLAlchemy wrapper.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        db_url: str | None = None,
+        replica_url: str | None = None,
+        options: dict | None = None,
+    ):
         self.logger = logging.getLogger(__name__)
-        self.db_url = get_vault_path()
+        # the configured vault unless given, e.g. a throwaway database for a simulation
+        if db_url is None:
+            db_url = get_vault_path()
+            replica_url = replica_url or get_vault_replica_path()
+            options = options if options is not None else get_vault_options()
+        unknown = set(options or {}) - set(DEFAULT_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown vault options: {', '.join(sorted(unknown))}")
+        self.db_url = db_url
+        self.replica_url = replica_url
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.options["temp_store"] = str(self.options["temp_store"]).upper()
+        if self.options["temp_store"] not in ("DEFAULT", "FILE", "MEMORY"):
+            raise ValueError(f"Invalid temp_store: {self.options['temp_store']}")
         self.logger.info(f"[Vault] Initializing SQLAlchemy: {self.db_url}")
 
         self.engine = self._create_engine(self.db_url)
         self.Session = scoped_session(sessionmaker(bind=self.engine))
 
+        # reads that may lag a little behind the primary go to the replica
+        self.replica_engine = None
+        if self.replica_url:
+            self.logger.info(f"[Vault] Read replica: {self.replica_url}")
+            self.replica_engine = self._create_engine(self.replica_url)
+            if self.replica_engine.dialect.name == "postgresql":
+                self.replica_engine = self.replica_engine.execution_options(
+                    postgresql_readonly=True
+                )
+            self.ReadSession = sessionmaker(bind=self.replica_engine)
+
         self._init_schema()
         self.logger.info("[Vault] Initialization complete.")
 
     def _create_engine(self, url: str):
+        opts = self.options
+        pool_args = {
+            "poolclass": TimedQueuePool,
+            "pool_size": opts["pool_size"],
+            "max_overflow": opts["max_overflow"],
+            "pool_timeout": opts["pool_timeout"],
+            "pool_recycle": opts["pool_recycle"],
+        }
         if url.startswith("sqlite"):
+            if make_url(url).database in (None, "", ":memory:"):
+                # an in-memory database lives in its one connection, keep the default pool
+                pool_args = {}
             engine = create_engine(
                 url,
-                connect_args={"check_same_thread": False, "timeout": 30},
-                pool_pre_ping=True,
+                connect_args={
+                    "check_same_thread": False,
+                    "timeout": opts["busy_timeout"] / 1000,
+                },
+                pool_pre_ping=opts["pool_pre_ping"],
+                **pool_args,
             )
 
             @event.listens_for(engine, "connect")
@@ -37,14 +168,40 @@ class Vault:
                 cursor = dbapi_connection.cursor()
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute(f"PRAGMA busy_timeout={int(opts['busy_timeout'])}")
+                cursor.execute(f"PRAGMA cache_size={int(opts['cache_size'])}")
+                cursor.execute(f"PRAGMA mmap_size={int(opts['mmap_size'])}")
+                cursor.execute(f"PRAGMA temp_store={opts['temp_store']}")
                 cursor.close()
 
             return engine
 
+        # server side timeouts, set once per connection
+        server_options = [
+            f"-c {name}={int(opts[name])}"
+            for name in ("statement_timeout", "lock_timeout")
+            if opts[name]
+        ]
+        connect_args = {"options": " ".join(server_options)} if server_options else {}
         return create_engine(
-            url, pool_size=20, max_overflow=10, pool_timeout=30, pool_pre_ping=True
+            url,
+            connect_args=connect_args,
+            pool_pre_ping=opts["pool_pre_ping"],
+            **pool_args,
         )
 
+    def pool_stats(self) -> dict:
+        """Checked out connections, overflow and checkout waits of each engine"""
+        engines = {"primary": self.engine}
+        if self.replica_engine is not None:
+            engines["replica"] = self.replica_engine
+        return {
+            name: engine.pool.stats()
+            if isinstance(engine.pool, TimedQueuePool)
+            else {"status": engine.pool.status()}
+            for name, engine in engines.items()
+        }
+
     def _init_schema(self):
         try:
             Base.metadata.create_all(self.engine)
@@ -65,6 +222,46 @@ class Vault:
         finally:
             session.close()
 
+    @contextmanager
+    def read_scope(self):
+        """
+        Session for reads only, on the read replica if one is configured.
+
+        Falls back to the primary if the replica can't be reached, or if the
+        caller pinned the primary with pin_primary. Nothing is committed.
+        """
+        if self.replica_engine is None or _primary_pinned.get():
+            with self.session_scope() as session:
+                yield session
+            return
+
+        session = self.ReadSession()
+        try:
+            # connect now, so an unreachable replica is noticed before any query
+            session.connection()
+        except OperationalError as e:
+            session.close()
+            self.logger.warning(f"[Vault] Replica unavailable, reading from primary: {e}")
+            with self.session_scope() as session:
+                yield session
+            return
+        try:
+            yield session
+        finally:
+            session.close()
+
+    @contextmanager
+    def pin_primary(self):
+        """
+        Route read_scope to the primary within this block, to read your own
+        writes without waiting for the replica to catch up.
+        """
+        token = _primary_pinned.set(True)
+        try:
+            yield
+        finally:
+            _primary_pinned.reset(token)
+
     @property
     def db(self):
         """Shorthand for session_scope - use with context manager: with vault.db as s:"""
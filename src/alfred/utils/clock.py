@@ -0,0 +1,60 @@
+"""
+Wall clock used by the engine, the patrol and the Slack handlers.
+
+Code asks `clock.now()` instead of `datetime.now()`, so a simulation can
+install a SimulatedClock and replay days of load in seconds.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+
+class Clock:
+    """System clock"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class SimulatedClock(Clock):
+    """Clock that only moves when told to"""
+
+    def __init__(self, start: datetime):
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def set(self, t: datetime):
+        self._now = t
+
+    def advance(self, delta: timedelta):
+        self._now += delta
+
+
+_clock = Clock()
+
+
+def now() -> datetime:
+    """Current time of the installed clock"""
+    return _clock.now()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock):
+    global _clock
+    _clock = clock
+
+
+@contextmanager
+def use_clock(clock: Clock):
+    """Install `clock` for the duration of the block"""
+    previous = get_clock()
+    set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -52,16 +52,39 @@ def load_config(config_file: str = None):
         return yaml.safe_load(f) or {}
 
 
+def _validate_db_path(db_path: str) -> str:
+    # validate path, only support sqlite and postgresql for now
+    if not (db_path.startswith("sqlite://") or db_path.startswith("postgresql+psycopg://")):
+        raise ValueError("Unsupported vault database path. Only sqlite and postgresql are supported.")
+    return db_path
+
+
 def get_vault_path(config_file: str = None) -> str:
     config = load_config(config_file)
     db_path = config.get("vault", {}).get("path", "")
     if not db_path:
         raise ValueError("Vault database path not configured.")
-    # validate path, only support sqlite and postgresql for now
-    if not (db_path.startswith("sqlite://") or db_path.startswith("postgresql+psycopg://")):
-        raise ValueError("Unsupported vault database path. Only sqlite and postgresql are supported.")
+    return _validate_db_path(db_path)
+
+
+def get_vault_replica_path(config_file: str = None) -> str | None:
+    """Read replica of the vault, None if not configured"""
+    config = load_config(config_file)
+    replica_path = config.get("vault", {}).get("replica_path", "")
+    if not replica_path:
+        return None
+    return _validate_db_path(replica_path)
+
+def get_vault_options(config_file: str = None) -> dict:
+    """Engine tuning under vault:, everything but the database paths"""
+    config = load_config(config_file)
+    vault = config.get("vault", {})
+    return {
+        key: value
+        for key, value in vault.items()
+        if key not in ("path", "replica_path", "init_sql")
+    }
 
-    return db_path
 
 def get_slack_channel(config_file: str = None) -> str:
     """Read file every time to get update"""
@@ -0,0 +1,31 @@
+"""Parse ddl offsets such as '30m', '1h30m' or '1' (one day)."""
+
+import re
+from datetime import timedelta
+
+_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+_PART = re.compile(r"(\d+)\s*([dhms])")
+_COMPOUND = re.compile(r"^(?:\d+\s*[dhms]\s*)+$")
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration made of `<number><unit>` parts, units d/h/m/s.
+
+    Parts can be combined in any order ('1h30m', '1d 2h'), a bare number means
+    days ('1' is one day).
+
+    Raises:
+        ValueError: if `value` is not a duration
+    """
+    value_str = str(value).strip().lower()
+    if value_str.isdigit():
+        return timedelta(days=int(value_str))
+    if not _COMPOUND.match(value_str):
+        raise ValueError(f"Unable to parse duration: '{value}'")
+    seconds = sum(int(n) * _UNITS[unit] for n, unit in _PART.findall(value_str))
+    return timedelta(seconds=seconds)
+
+
+def duration_seconds(value: str) -> int:
+    """parse_duration as whole seconds"""
+    return int(parse_duration(value).total_seconds())
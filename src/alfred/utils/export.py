@@ -0,0 +1,70 @@
+"""Serialize streamed rows as NDJSON or CSV, one chunk per row."""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows):
+    """Yield one JSON document per row, newline terminated"""
+    for row in rows:
+        yield json.dumps(
+            {key: _plain(value) for key, value in row.items()}, ensure_ascii=False
+        ) + "\n"
+
+
+def iter_csv(rows, fieldnames):
+    """Yield the CSV header, then one CSV line per row"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writeheader()
+    yield flush()
+    for row in rows:
+        writer.writerow({key: _plain(value) for key, value in row.items()})
+        yield flush()
+
+
+def iter_export(rows, fmt: str, fieldnames):
+    """
+    Serialize `rows` lazily in `fmt`.
+
+    Raises:
+        ValueError: if `fmt` is not one of EXPORT_FORMATS
+    """
+    if fmt == "ndjson":
+        return iter_ndjson(rows)
+    if fmt == "csv":
+        return iter_csv(rows, fieldnames)
+    raise ValueError(
+        f"Unknown export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}"
+    )
+
+
+def write_export(rows, fp, fmt: str, fieldnames) -> int:
+    """Write `rows` to the text file `fp` in `fmt`, return the number of rows"""
+    count = -1 if fmt == "csv" else 0  # the header is not a row
+    for chunk in iter_export(rows, fmt, fieldnames):
+        fp.write(chunk)
+        count += 1
+    return count
@@ -1,3 +1,6 @@
+import json
+
+
 def format_todos(todos):
     if not todos:
         return "_No todos found._"
@@ -188,4 +191,42 @@ def build_add_template_view(view_callback_id: str, current_freq: str = "weekdays
         "submit": {"type": "plain_text", "text": "保存"},
         "close": {"type": "plain_text", "text": "取消"},
         "blocks": blocks
-    }
\ No newline at end of file
+    }
+
+def build_todo_page_blocks(page, query):
+    """
+    One page of `/alfred list todos`, one section per todo.
+    The Prev/Next buttons carry `query` (the filters) plus the page cursor.
+    """
+    todos = page["todos"]
+    blocks = [
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "*TODOs:*" if todos else "_No todos found._"},
+        }
+    ]
+    for line in format_todos(todos).splitlines() if todos else []:
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": line}})
+
+    buttons = []
+    if page["prev_cursor"]:
+        buttons.append(
+            {
+                "type": "button",
+                "action_id": "list_todos_prev",
+                "text": {"type": "plain_text", "text": "◀ Prev"},
+                "value": json.dumps({**query, "before": page["prev_cursor"]}),
+            }
+        )
+    if page["next_cursor"]:
+        buttons.append(
+            {
+                "type": "button",
+                "action_id": "list_todos_next",
+                "text": {"type": "plain_text", "text": "Next ▶"},
+                "value": json.dumps({**query, "after": page["next_cursor"]}),
+            }
+        )
+    if buttons:
+        blocks.append({"type": "actions", "block_id": "block_todo_page", "elements": buttons})
+    return blocks
@@ -0,0 +1,527 @@
+"""
+Benchmarks for the task layer, collected by pytest together with the tests.
+
+The dataset benchmarks run on seed(), scaled by the number of todos:
+
+    ALFRED_BENCH_SCALES=1000,10000,100000 ALFRED_BENCH_TODO_ROWS=1000,100000,2000000 \
+        ALFRED_BENCH_JSON=results.json pytest tests/bench_bulletin.py -s
+
+bench_task_layer runs on a SQLite file in a temporary directory, and on
+Postgres when the configured vault is a Postgres one or ALFRED_BENCH_PG_URL is
+set (its tables are dropped and recreated), it is skipped otherwise. With
+ALFRED_BENCH_JSON the timings of all benchmarks are written as JSON, one entry
+per benchmark, backend, scale and operation, so two runs can be compared.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy
+from croniter import croniter
+from sqlalchemy import Date, func, insert, select
+
+from alfred.task.bulletin import Bulletin
+from alfred.task.vault import get_vault
+from alfred.task.vault.models import (
+    Base,
+    Todo,
+    TodoStatus,
+    TodoStatusLog,
+    TodoTemplate,
+)
+from alfred.task.vault.sa_vault import Vault
+
+# (cron, share of the templates), mostly the weekday reminders the modal creates
+CRON_MIX = [
+    ("0 9 * * 1-5", 40),
+    ("30 9 * * *", 15),
+    ("0 9-18 * * 1-5", 10),
+    ("0 10 * * 1", 15),
+    ("0 9 * * FRI#2", 10),
+    ("0 14 1 * *", 10),
+]
+TODOS_PER_TEMPLATE = 10
+USERS = 200
+# a Monday, one minute before the 09:00 burst, the last seeded day is today
+NOW = datetime(2025, 11, 10, 8, 59)
+
+
+def _cron_of(i):
+    slot = i % sum(share for _, share in CRON_MIX)
+    for cron, share in CRON_MIX:
+        if slot < share:
+            return cron
+        slot -= share
+
+
+def seed(vault, todos: int, per_day: int):
+    """
+    Replace the vault's tables with `todos` todos, `per_day` a day up to today,
+    from todos / TODOS_PER_TEMPLATE templates of CRON_MIX. Todos of past days
+    are finished (mostly completed), today's are pending. Each todo has its
+    creation log, finished ones one more.
+
+    Returns:
+        dict with the active "template_ids", today's "pending" todo ids and
+        "mid_day", a date in the middle of the history
+    """
+    Base.metadata.drop_all(vault.engine)
+    # pooled connections may hold prepared statements bound to the dropped tables
+    vault.engine.dispose()
+    Base.metadata.create_all(vault.engine)
+
+    days = math.ceil(todos / per_day)
+    first_day = datetime.combine(NOW.date(), datetime.min.time()) - timedelta(
+        days=days - 1
+    )
+    templates = max(todos // TODOS_PER_TEMPLATE, 1)
+    next_fire = {cron: croniter(cron, NOW).get_next(datetime) for cron, _ in CRON_MIX}
+    template_rows = [
+        {
+            "id": i + 1,
+            "user_id": f"U{i % USERS}",
+            "content": f"Task {i}",
+            "cron": _cron_of(i),
+            "ddl_offset": "1h",
+            "ddl_offset_seconds": 3600,
+            # a few one-off reminders, one in ten was retired
+            "run_once": i % 25 == 0,
+            "is_active": i % 10 != 9,
+            "next_fire_at": next_fire[_cron_of(i)],
+            "created_at": first_day - timedelta(days=1),
+        }
+        for i in range(templates)
+    ]
+    todo_rows = []
+    log_rows = []
+    pending = []
+    for n in range(todos):
+        day, i = divmod(n, per_day)
+        remind_time = first_day + timedelta(days=day, hours=9, seconds=i)
+        if day == days - 1:
+            status = TodoStatus.PENDING
+            pending.append(n + 1)
+        elif n % 20 == 0:
+            status = TodoStatus.ESCALATED
+        elif n % 50 == 1:
+            status = TodoStatus.REVOKED
+        else:
+            status = TodoStatus.COMPLETED
+        todo_rows.append(
+            {
+                "id": n + 1,
+                "template_id": n % templates + 1,
+                "user_id": f"U{n % USERS}",
+                "remind_time": remind_time,
+                "ddl_time": remind_time + timedelta(hours=1),
+                "status": status,
+            }
+        )
+        log_rows.append(
+            {
+                "todo_id": n + 1,
+                "old_status": None,
+                "new_status": TodoStatus.PENDING,
+                "changed_at": remind_time,
+            }
+        )
+        if status != TodoStatus.PENDING:
+            log_rows.append(
+                {
+                    "todo_id": n + 1,
+                    "old_status": TodoStatus.PENDING,
+                    "new_status": status,
+                    "changed_at": remind_time + timedelta(minutes=30),
+                }
+            )
+
+    with vault.session_scope() as session:
+        for model, rows in (
+            (TodoTemplate, template_rows),
+            (Todo, todo_rows),
+            (TodoStatusLog, log_rows),
+        ):
+            for start in range(0, len(rows), 10_000):
+                session.execute(insert(model), rows[start : start + 10_000])
+    # ids were given explicitly, move the Postgres sequences past them
+    if vault.engine.dialect.name == "postgresql":
+        with vault.engine.begin() as conn:
+            for table, column in (
+                ("todo_templates", "template_id"),
+                ("todos", "todo_id"),
+                ("todo_status_logs", "log_id"),
+            ):
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'),"
+                    f" (SELECT max({column}) FROM {table}))"
+                )
+    with vault.engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return {
+        "template_ids": [row["id"] for row in template_rows if row["is_active"]],
+        "pending": pending,
+        "mid_day": (first_day + timedelta(days=days // 2)).date(),
+    }
+
+
+def _timed(fn, runs):
+    """Milliseconds of each `fn(i)` for i in range(runs)"""
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _median_ms(fn, repeat=15):
+    return statistics.median(_timed(lambda _: fn(), repeat))
+
+
+@pytest.fixture(scope="module")
+def bench_results():
+    """Timings of the module, written to ALFRED_BENCH_JSON if set"""
+    results = []
+    yield results
+    path = os.getenv("ALFRED_BENCH_JSON")
+    if path:
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "sqlalchemy": sqlalchemy.__version__,
+                    "results": results,
+                },
+                fp,
+                indent=2,
+            )
+
+
+def _record(bench_results, bench, backend, scale, op, samples):
+    result = {
+        "bench": bench,
+        "backend": backend,
+        "scale": scale,
+        "op": op,
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+    bench_results.append(result)
+    return result
+
+
+BURST_SIZES = [1, 10, 100, 1000]
+
+
+def _burst(template_ids, size):
+    remind_time = datetime(2025, 11, 10, 9, 0)
+    return [
+        {
+            "template_id": template_ids[i % len(template_ids)],
+            "user_id": f"U{i}",
+            "ddl_offset_seconds": 3600,
+            "remind_time": remind_time + timedelta(minutes=i),
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("size", BURST_SIZES)
+def bench_create_todos_burst(size, statement_counter):
+    """09:00 burst: per-todo create_todo vs. bulk create_todos"""
+    bulletin = Bulletin()
+    template_ids = [
+        bulletin.add_template(f"U{i}", f"Task {i}", "0 9 * * 1-5", "1h", "0")
+        for i in range(10)
+    ]
+    create_time = datetime(2025, 11, 10, 8, 59)
+
+    results = {}
+    for name in ("create_todo", "create_todos"):
+        todos = _burst(template_ids, size)
+        if name == "create_todo":
+            # shift the burst so both runs insert fresh rows
+            for todo in todos:
+                todo["remind_time"] += timedelta(days=1)
+        statement_counter["count"] = 0
+        start = time.perf_counter()
+        with bulletin.run_in_session() as session:
+            if name == "create_todo":
+                todo_ids = [
+                    bulletin.create_todo(
+                        session,
+                        todo["user_id"],
+                        todo["template_id"],
+                        todo["ddl_offset_seconds"],
+                        todo["remind_time"],
+                        create_time,
+                    )
+                    for todo in todos
+                ]
+            else:
+                todo_ids = bulletin.create_todos(session, todos, create_time)
+        elapsed = time.perf_counter() - start
+        assert len(set(todo_ids)) == size
+        results[name] = (statement_counter["count"], elapsed)
+
+    print(f"\n=== burst size {size} ===")
+    for name, (statements, elapsed) in results.items():
+        print(f"{name:>13}: {statements:5d} statements, {elapsed * 1000:9.2f} ms")
+
+    # two INSERTs per chunk, no matter how big the burst is
+    assert results["create_todos"][0] <= results["create_todo"][0]
+
+
+def _templates(count, distinct):
+    # ~`distinct` shared expressions, like the weekday and DOW#N ones from the modal
+    crons = [f"{m} {9 + m % 8} * * 1-5" for m in range(distinct // 2)] + [
+        f"{m} 9 * * FRI#{1 + m % 4}" for m in range(distinct - distinct // 2)
+    ]
+    created_at = datetime(2025, 11, 10, 8, 0)
+    return [
+        TodoTemplate(
+            id=i,
+            user_id=f"U{i}",
+            content=f"Task {i}",
+            cron=crons[i % len(crons)],
+            ddl_offset="1h",
+            run_once=False,
+            created_at=created_at,
+        )
+        for i in range(count)
+    ]
+
+
+def bench_advance_fire_times_shared_crons():
+    """10k templates over 50 cron expressions, one day ahead"""
+    bulletin = Bulletin()
+    current_time = datetime(2025, 11, 10, 8, 30)
+    horizon = current_time + timedelta(hours=24)
+
+    # what the engine did before: one croniter per template
+    templates = _templates(10_000, 50)
+    start = time.perf_counter()
+    per_template = {}
+    for template in templates:
+        it = croniter(template.cron, current_time)
+        fire_times = []
+        fire_time = it.get_next(datetime)
+        while fire_time <= horizon:
+            fire_times.append(fire_time)
+            fire_time = it.get_next(datetime)
+        per_template[template.id] = fire_times
+    naive = time.perf_counter() - start
+
+    templates = _templates(10_000, 50)
+    start = time.perf_counter()
+    memo = {}
+    grouped = {
+        template.id: bulletin.advance_fire_times(template, current_time, horizon, memo)
+        for template in templates
+    }
+    deduplicated = time.perf_counter() - start
+
+    print(
+        f"\nper template: {naive * 1000:9.2f} ms, "
+        f"per expression: {deduplicated * 1000:9.2f} ms ({len(memo)} evaluated)"
+    )
+    assert grouped == per_template
+    assert len(memo) == 50
+
+
+# ALFRED_BENCH_TODO_ROWS=1000,100000,2000000 to go to millions
+TODO_ROWS = [
+    int(n) for n in os.getenv("ALFRED_BENCH_TODO_ROWS", "1000,10000").split(",")
+]
+
+
+def bench_get_todos_by_day(test_vault, bench_results):
+    """Patrol query of one day (200 todos) stays flat as the todos table grows"""
+    backend = test_vault.engine.dialect.name
+    bulletin = Bulletin(test_vault)
+    medians = {}
+    for rows in TODO_ROWS:
+        query_date = seed(test_vault, rows, per_day=200)["mid_day"]
+        samples = _timed(lambda _: bulletin.get_todos(query_date), 15)
+        medians[rows] = _record(
+            bench_results, "get_todos_by_day", backend, rows, "get_todos(date)", samples
+        )["median_ms"]
+
+        day_start = datetime.combine(query_date, datetime.min.time())
+        with bulletin.run_in_session() as session:
+            range_ms = _median_ms(
+                lambda: session.execute(
+                    select(Todo.id).where(
+                        Todo.remind_time >= day_start,
+                        Todo.remind_time < day_start + timedelta(days=1),
+                    )
+                ).all()
+            )
+            # the old predicate, wraps the column so no index can be used
+            cast_ms = _median_ms(
+                lambda: session.execute(
+                    select(Todo.id).where(
+                        func.cast(Todo.remind_time, Date) == query_date
+                    )
+                ).all()
+            )
+
+        print(
+            f"\n{rows:>9} todos: get_todos {medians[rows]:8.2f} ms, "
+            f"remind_time range {range_ms:8.2f} ms, "
+            f"cast(remind_time as date) {cast_ms:8.2f} ms"
+        )
+        assert len(bulletin.get_todos(query_date)) == 200
+
+    # an index range scan, not a scan of the whole table: the same 200 rows cost
+    # about the same however many rows there are, with slack for timer noise
+    smallest, largest = min(TODO_ROWS), max(TODO_ROWS)
+    assert medians[largest] <= 3 * medians[smallest] + 1.0, medians
+
+
+def _orm_dict_todos(bulletin, day_start):
+    # what get_todos did before: ORM entities, then a dict per todo
+    with bulletin.run_in_session() as session:
+        rows = session.execute(
+            select(Todo, TodoTemplate)
+            .join(TodoTemplate, Todo.template_id == TodoTemplate.id)
+            .where(
+                Todo.remind_time >= day_start,
+                Todo.remind_time < day_start + timedelta(days=1),
+            )
+            .order_by(Todo.remind_time)
+        ).all()
+        return [
+            {
+                "todo_id": td.id,
+                "template_id": tpl.id,
+                "content": tpl.content,
+                "user_id": td.user_id,
+                "status": td.status.value,
+                "remind_time": td.remind_time,
+                "ddl_time": td.ddl_time,
+            }
+            for td, tpl in rows
+        ]
+
+
+def _memory_kib(fn):
+    """(retained, peak) KiB allocated by fn, the result is kept alive while measuring"""
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained / 1024, peak / 1024
+
+
+def bench_todo_rows_vs_orm_dicts(test_vault, bench_results):
+    """10k todos of one day: ORM entities copied into dicts vs. TodoRow tuples"""
+    bulletin = Bulletin(test_vault)
+    seed(test_vault, 10_000, per_day=10_000)
+    query_date = NOW.date()
+    day_start = datetime.combine(query_date, datetime.min.time())
+
+    results = {
+        "orm + dicts": lambda: _orm_dict_todos(bulletin, day_start),
+        "TodoRow": lambda: bulletin.get_todos(query_date),
+    }
+    stats = {}
+    for name, fn in results.items():
+        assert len(fn()) == 10_000
+        samples = _timed(lambda _: fn(), 5)
+        _record(
+            bench_results,
+            "todo_rows_vs_orm_dicts",
+            test_vault.engine.dialect.name,
+            10_000,
+            name,
+            samples,
+        )
+        stats[name] = (statistics.median(samples), *_memory_kib(fn))
+
+    print()
+    for name, (ms, retained, peak) in stats.items():
+        print(
+            f"{name:>12}: {ms:8.2f} ms, "
+            f"{retained:9.0f} KiB retained, {peak:9.0f} KiB peak"
+        )
+    assert stats["TodoRow"][1] < stats["orm + dicts"][1]
+
+
+# numbers of todos of bench_task_layer
+SCALES = [int(n) for n in os.getenv("ALFRED_BENCH_SCALES", "1000,10000").split(",")]
+TASK_LAYER_DAYS = 30
+
+
+def _backend_vault(backend, tmp_path):
+    if backend == "sqlite":
+        return Vault(db_url=f"sqlite:///{tmp_path / 'bench.db'}", options={})
+    configured = get_vault()
+    if configured.engine.dialect.name == "postgresql":
+        return configured
+    url = os.getenv("ALFRED_BENCH_PG_URL")
+    if not url:
+        pytest.skip("no Postgres, set ALFRED_BENCH_PG_URL")
+    return Vault(db_url=url, options={})
+
+
+@pytest.mark.parametrize("scale", SCALES)
+@pytest.mark.parametrize("backend", ["sqlite", "postgresql"])
+def bench_task_layer(backend, scale, tmp_path, bench_results):
+    """schedule_todos, get_todos(date), complete_todo, set_template_active_status, fetch_all"""
+    vault = _backend_vault(backend, tmp_path)
+    bulletin = Bulletin(vault)
+    start = time.perf_counter()
+    dataset = seed(vault, scale, per_day=max(scale // TASK_LAYER_DAYS, 1))
+    seed_ms = (time.perf_counter() - start) * 1000
+    template_ids, pending = dataset["template_ids"], dataset["pending"]
+
+    today = NOW.date()
+    created = []
+    repeat = 5
+    operations = {
+        # read paths first, on the dataset as seeded
+        "get_todos(date)": (lambda i: bulletin.get_todos(today), repeat),
+        "fetch_all": (lambda i: bulletin.fetch_all(), 1),
+        "complete_todo": (
+            lambda i: bulletin.complete_todo(pending[i], NOW),
+            min(repeat, len(pending)),
+        ),
+        # deactivation also revokes the open todos of the template
+        "set_template_active_status": (
+            lambda i: bulletin.set_template_active_status(
+                template_ids[i], False, NOW
+            ),
+            min(repeat, len(template_ids)),
+        ),
+        # the 09:00 burst, once, a second pass would find nothing to do
+        "schedule_todos": (
+            lambda i: created.append(bulletin.schedule_todos(NOW)),
+            1,
+        ),
+    }
+
+    print(f"\n=== {backend}, {scale} todos (seeded in {seed_ms:.0f} ms) ===")
+    for op, (fn, runs) in operations.items():
+        result = _record(
+            bench_results, "task_layer", backend, scale, op, _timed(fn, runs)
+        )
+        print(
+            f"{op:>27}: median {result['median_ms']:9.2f} ms, "
+            f"min {result['min_ms']:9.2f} ms, max {result['max_ms']:9.2f} ms ({runs} runs)"
+        )
+
+    assert created and created[0] > 0
+    if vault is not get_vault():
+        vault.engine.dispose()
@@ -0,0 +1,46 @@
+"""Benchmarks for cron evaluation, collected by pytest together with the tests."""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from croniter import croniter
+
+from alfred.task.cron import CompiledCron
+
+CRONS = ["0 9 * * 1-5", "30 09 * * FRI#2", "*/15 8-18 * * *"]
+
+
+@pytest.mark.parametrize("cron", CRONS)
+def bench_fire_check(cron):
+    """Minute-by-minute fire checks over two days: croniter.match vs. bitmasks"""
+    compiled = CompiledCron.compile(cron)
+    minutes = [datetime(2025, 11, 3) + timedelta(minutes=i) for i in range(2 * 24 * 60)]
+
+    start = time.perf_counter()
+    expected = [croniter.match(cron, t) for t in minutes]
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [compiled.fires_at(t) for t in minutes]
+    bitmask = time.perf_counter() - start
+
+    start = time.perf_counter()
+    it = croniter(cron, minutes[0])
+    expected_next = [it.get_next(datetime) for _ in range(1000)]
+    naive_next = time.perf_counter() - start
+
+    start = time.perf_counter()
+    t, actual_next = minutes[0], []
+    for _ in range(1000):
+        t = compiled.next_after(t)
+        actual_next.append(t)
+    bitmask_next = time.perf_counter() - start
+
+    print(
+        f"\n{cron!r}: {len(minutes)} checks croniter {naive * 1000:8.2f} ms, "
+        f"bitmask {bitmask * 1000:8.2f} ms; 1000 next: croniter "
+        f"{naive_next * 1000:8.2f} ms, bitmask {bitmask_next * 1000:8.2f} ms"
+    )
+    assert actual == expected
+    assert actual_next == expected_next
@@ -4,6 +4,7 @@ import sys
 import os
 from unittest.mock import MagicMock
 import pytest
+from sqlalchemy import event
 
 from alfred.task.vault.models import Base
 
@@ -52,6 +53,8 @@ def test_vault():
 
     vault = get_vault()
     Base.metadata.drop_all(vault.engine)
+    # pooled connections may hold prepared statements bound to the dropped tables
+    vault.engine.dispose()
 
     # Recreate schema
     Base.metadata.create_all(vault.engine)
@@ -61,3 +64,19 @@ def test_vault():
 
     # delete all tables after test
     Base.metadata.drop_all(vault.engine)
+
+
+@pytest.fixture
+def statement_counter(test_vault):
+    """
+    Count SQL statements sent to the vault engine while the test runs.
+    An executemany call or one insertmanyvalues batch counts as one statement.
+    """
+    counter = {"count": 0}
+
+    def count(*_):
+        counter["count"] += 1
+
+    event.listen(test_vault.engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(test_vault.engine, "before_cursor_execute", count)
@@ -57,6 +57,17 @@ def test_block_builder_styles_output(sample_todos, style, capsys):
     # We use capsys to ensure output is captured if needed, 
     # but for "printing" to see it during test run with -s, simple print works.
 
+
+@pytest.mark.parametrize("style", ["standard", "saas", "gitflow"])
+def test_summary_blocks_mention_tomorrow(sample_todos, style):
+    BlockBuilder.set_style(style)
+    without_tomorrow = BlockBuilder.build_summary_blocks(sample_todos)
+    with_tomorrow = BlockBuilder.build_summary_blocks(sample_todos, sample_todos[:1])
+    assert len(with_tomorrow) == len(without_tomorrow) + 1
+    assert with_tomorrow[-1]["type"] == "context"
+    assert "1" in with_tomorrow[-1]["elements"][0]["text"]
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main(['-s', __file__])
@@ -1,8 +1,12 @@
+import threading
 from datetime import datetime, timedelta
 
+import pytest
+from sqlalchemy import inspect
+
 from alfred.task.bulletin import Bulletin
 from alfred.task.vault import get_vault
-from alfred.task.vault.models import Todo, TodoStatus, TodoStatusLog
+from alfred.task.vault.models import Todo, TodoStatus, TodoStatusLog, TodoTemplate
 
 
 def test_complete_todo_records_status_and_log():
@@ -153,3 +157,358 @@ def test_get_todos_with_date_filter():
 	# test get_todos without date parameter (should get all)
 	todos_all = bulletin.get_todos()
 	assert len(todos_all) == 2
+
+
+def test_create_todos_bulk_inserts_todos_and_logs(statement_counter):
+	bulletin = Bulletin()
+	template_id = bulletin.add_template(
+		user_id="U_BULK",
+		content="Bulk",
+		cron="0 9 * * *",
+		ddl_offset="30m",
+		run_once="0",
+	)
+
+	remind_time = datetime(2025, 11, 10, 9, 0)
+	todos = [
+		{
+			"template_id": template_id,
+			"user_id": f"U_BULK{i}",
+			"ddl_offset_seconds": 30 * 60,
+			"remind_time": remind_time,
+		}
+		for i in range(3)
+	]
+	statement_counter["count"] = 0
+	with bulletin.run_in_session() as session:
+		todo_ids = bulletin.create_todos(session, todos, remind_time)
+	# one INSERT for todos, one for logs (plus COMMIT is not a cursor execute)
+	assert statement_counter["count"] == 2
+
+	for i, todo_id in enumerate(todo_ids):
+		todo = bulletin.get_todo(todo_id)
+		assert todo["user_id"] == f"U_BULK{i}"
+		assert todo["status"] == "pending"
+		assert todo["ddl_time"] == remind_time + timedelta(minutes=30)
+		logs = bulletin.get_todo_log(todo_id)
+		assert [(l["old_status"], l["new_status"]) for l in logs] == [(None, "pending")]
+
+
+def test_add_template_normalizes_compound_offset():
+	bulletin = Bulletin()
+	template_id = bulletin.add_template(
+		user_id="U_OFFSET",
+		content="Compound",
+		cron="0 9 * * *",
+		ddl_offset="1h30m",
+		run_once="0",
+	)
+	with bulletin.run_in_session() as session:
+		assert session.get(TodoTemplate, template_id).ddl_offset_seconds == 5400
+
+	bulletin.schedule_todos("2025-11-10T08:59:30")
+	todo = bulletin.get_todos()[0]
+	assert todo["ddl_time"] == datetime(2025, 11, 10, 10, 30)
+
+	with pytest.raises(ValueError):
+		bulletin.add_template("U_OFFSET", "Bad", "0 9 * * *", "1h30", "0")
+
+
+def test_archive_todos_moves_finished_rows_and_keeps_them_readable():
+	bulletin = Bulletin()
+	template_id = bulletin.add_template(
+		user_id="U_ARCHIVE",
+		content="Archive",
+		cron="0 9 * * *",
+		ddl_offset="1h",
+		run_once="0",
+	)
+	remind_times = [
+		datetime(2025, 8, 30, 9, 0),  # completed, old
+		datetime(2025, 9, 1, 9, 0),  # revoked, old, another month
+		datetime(2025, 9, 2, 9, 0),  # still pending, old
+		datetime(2025, 11, 9, 9, 0),  # completed, recent
+	]
+	with bulletin.run_in_session() as session:
+		todo_ids = bulletin.create_todos(
+			session,
+			[
+				{
+					"template_id": template_id,
+					"user_id": "U_ARCHIVE",
+					"ddl_offset_seconds": 3600,
+					"remind_time": t,
+				}
+				for t in remind_times
+			],
+			remind_times[0],
+		)
+	bulletin.complete_todo(todo_ids[0], "2025-08-30T09:30:00")
+	bulletin.complete_todo(todo_ids[3], "2025-11-09T09:30:00")
+	with bulletin.run_in_session() as session:
+		session.get(Todo, todo_ids[1]).status = TodoStatus.REVOKED
+	# reminded todos, the ledger must not keep them from being archived
+	bulletin.record_notifications(
+		[(todo_ids[0], "normal"), (todo_ids[0], "overdue"), (todo_ids[2], "normal")],
+		remind_times[0],
+	)
+
+	archived = bulletin.archive_todos(
+		"2025-11-10T00:00:00", timedelta(days=30), chunk_size=1
+	)
+	assert archived == 2
+	if bulletin.vault.engine.dialect.name == "postgresql":
+		# one partition per month of remind_time
+		partitions = set(inspect(bulletin.vault.engine).get_table_names())
+		assert {"todos_archive_2025_08", "todos_archive_2025_09"} <= partitions
+
+	with bulletin.run_in_session() as session:
+		hot_ids = {t.id for t in session.query(Todo).all()}
+		assert hot_ids == {todo_ids[2], todo_ids[3]}
+		assert session.query(TodoStatusLog).filter(
+			TodoStatusLog.todo_id.in_(todo_ids[:2])
+		).count() == 0
+	assert bulletin.get_sent_notifications(remind_times[0].date()) == set()
+	assert bulletin.get_sent_notifications(remind_times[2].date()) == {
+		(todo_ids[2], "normal")
+	}
+
+	# archived todos are still found by id, with their whole history
+	archived_todo = bulletin.get_todo(todo_ids[0])
+	assert archived_todo["status"] == "completed"
+	assert archived_todo["content"] == "Archive"
+	logs = bulletin.get_todo_log(todo_ids[0])
+	assert [(l["old_status"], l["new_status"]) for l in logs] == [
+		(None, "pending"),
+		("pending", "completed"),
+	]
+	assert bulletin.get_todo(todo_ids[1])["status"] == "revoked"
+
+	# nothing left to archive
+	assert bulletin.archive_todos("2025-11-10T00:00:00", timedelta(days=30)) == 0
+
+
+def test_iter_rows_streams_in_batches():
+	bulletin = Bulletin()
+	template_id = bulletin.add_template("U1", "Stream", "* * * * *", "1h", "0")
+	remind_time = datetime(2025, 11, 10, 9, 0)
+	with bulletin.run_in_session() as session:
+		todo_ids = bulletin.create_todos(
+			session,
+			[
+				{
+					"template_id": template_id,
+					"user_id": "U1",
+					"ddl_offset_seconds": 3600,
+					"remind_time": remind_time + timedelta(minutes=i),
+				}
+				for i in range(5)
+			],
+			remind_time,
+		)
+	bulletin.complete_todo(todo_ids[0], remind_time)
+
+	rows = bulletin.iter_rows("todos", batch_size=2)
+	first = next(rows)
+	assert first["todo_id"] == todo_ids[0]
+	assert first["status"] == "completed"
+	assert [row["todo_id"] for row in rows] == todo_ids[1:]
+
+	logs = list(bulletin.iter_rows("todo_status_logs"))
+	assert logs[-1]["old_status"] == "pending"
+	assert logs[-1]["new_status"] == "completed"
+	assert bulletin.fetch_all()["todo_status_logs"] == logs
+
+	with pytest.raises(ValueError):
+		next(bulletin.iter_rows("engine_state"))
+
+
+def test_get_todos_page_walks_both_ways_with_filters():
+	bulletin = Bulletin()
+	template_id = bulletin.add_template("U1", "Page", "* * * * *", "1h", "0")
+	first = datetime(2025, 11, 10, 9, 0)
+	with bulletin.run_in_session() as session:
+		# two users share each remind_time, so the todo_id breaks the tie
+		todo_ids = bulletin.create_todos(
+			session,
+			[
+				{
+					"template_id": template_id,
+					"user_id": f"U{i % 2}",
+					"ddl_offset_seconds": 3600,
+					"remind_time": first + timedelta(hours=i // 2),
+				}
+				for i in range(7)
+			],
+			first,
+		)
+	bulletin.complete_todo(todo_ids[1], first)
+
+	pages = []
+	page = bulletin.get_todos_page(limit=3)
+	while True:
+		pages.append([t["todo_id"] for t in page["todos"]])
+		if not page["next_cursor"]:
+			break
+		page = bulletin.get_todos_page(limit=3, after=page["next_cursor"])
+	assert pages == [todo_ids[:3], todo_ids[3:6], todo_ids[6:]]
+
+	# and back from the last page
+	page = bulletin.get_todos_page(limit=3, before=page["prev_cursor"])
+	assert [t["todo_id"] for t in page["todos"]] == todo_ids[3:6]
+	page = bulletin.get_todos_page(limit=3, before=page["prev_cursor"])
+	assert [t["todo_id"] for t in page["todos"]] == todo_ids[:3]
+	assert page["prev_cursor"] is None
+	assert page["next_cursor"]
+
+	page = bulletin.get_todos_page(
+		statuses=["pending"],
+		user_id="U1",
+		start="2025-11-10T10:00:00",
+		end=first + timedelta(hours=3),
+	)
+	assert [t["todo_id"] for t in page["todos"]] == [todo_ids[3], todo_ids[5]]
+	assert page["next_cursor"] is None and page["prev_cursor"] is None
+
+
+def _open_todo(bulletin, content):
+	template_id = bulletin.add_template("U1", content, "0 9 * * *", "1h", "0")
+	remind_time = datetime(2025, 11, 10, 9, 0)
+	with bulletin.run_in_session() as session:
+		(todo_id,) = bulletin.create_todos(
+			session,
+			[
+				{
+					"template_id": template_id,
+					"user_id": "U1",
+					"ddl_offset_seconds": 3600,
+					"remind_time": remind_time,
+				}
+			],
+			remind_time,
+		)
+	return todo_id
+
+
+def test_transitions_return_the_todo_and_apply_once():
+	bulletin = Bulletin()
+	_open_todo(bulletin, "Other")
+	todo_id = _open_todo(bulletin, "Mine")
+
+	todo = bulletin.complete_todo(todo_id, "2025-11-10T09:05:00")
+	assert todo["todo_id"] == todo_id
+	assert todo["content"] == "Mine"
+	assert todo["status"] == "completed"
+	assert todo["ddl_time"] == datetime(2025, 11, 10, 10, 0)
+	# a second click changes nothing
+	assert bulletin.complete_todo(todo_id, "2025-11-10T09:06:00") is None
+
+	todo = bulletin.revert_todo_completion(todo_id, "2025-11-10T09:07:00")
+	assert todo["status"] == "pending"
+	assert bulletin.revert_todo_completion(todo_id, "2025-11-10T09:08:00") is None
+	assert bulletin.complete_todo(12345, "2025-11-10T09:08:00") is None
+
+	logs = bulletin.get_todo_log(todo_id)
+	assert [(l["old_status"], l["new_status"]) for l in logs] == [
+		(None, "pending"),
+		("pending", "completed"),
+		("completed", "pending"),
+	]
+
+
+def test_concurrent_completions_log_once():
+	bulletin = Bulletin()
+	if bulletin.vault.engine.dialect.name != "postgresql":
+		pytest.skip("SQLite serializes writers, there is no race to lose")
+	todo_id = _open_todo(bulletin, "Race")
+	now = datetime(2025, 11, 10, 9, 5)
+
+	results = []
+	with bulletin.run_in_session() as session:
+		first = bulletin._transition(
+			session, todo_id, (TodoStatus.PENDING,), TodoStatus.COMPLETED, now
+		)
+		assert first is not None
+		# the second click blocks on the row lock until the first commits
+		second = threading.Thread(
+			target=lambda: results.append(bulletin.complete_todo(todo_id, now))
+		)
+		second.start()
+		second.join(timeout=0.5)
+		assert second.is_alive()
+	second.join()
+
+	assert results == [None]
+	logs = bulletin.get_todo_log(todo_id)
+	assert [l["new_status"] for l in logs] == ["pending", "completed"]
+
+
+def test_deactivating_templates_revokes_open_todos_in_bulk(statement_counter):
+	bulletin = Bulletin()
+	template_ids = [
+		bulletin.add_template("U1", f"Bulk {i}", "* * * * *", "1h", "0")
+		for i in range(3)
+	]
+	remind_time = datetime(2025, 11, 10, 9, 0)
+	with bulletin.run_in_session() as session:
+		todo_ids = bulletin.create_todos(
+			session,
+			[
+				{
+					"template_id": template_ids[i % 3],
+					"user_id": "U1",
+					"ddl_offset_seconds": 3600,
+					"remind_time": remind_time + timedelta(minutes=i),
+				}
+				for i in range(30)
+			],
+			remind_time,
+		)
+		session.get(Todo, todo_ids[1]).status = TodoStatus.ESCALATED
+	bulletin.complete_todo(todo_ids[0], remind_time)
+
+	statement_counter["count"] = 0
+	result = bulletin.set_templates_active_status(
+		template_ids[:2] + [9999], False, "2025-11-10T10:00:00"
+	)
+	# 20 todos of the first two templates, one of them already completed
+	assert result == {"template_ids": template_ids[:2], "revoked": 19}
+	# the same few statements however many todos there are
+	assert statement_counter["count"] <= 4
+
+	statuses = {t["todo_id"]: t["status"] for t in bulletin.get_todos()}
+	assert statuses[todo_ids[0]] == "completed"
+	assert [statuses[todo_ids[i]] for i in range(1, 30) if i % 3 != 2] == ["revoked"] * 19
+	assert {statuses[todo_ids[i]] for i in range(2, 30, 3)} == {"pending"}
+	logs = bulletin.get_todo_log(todo_ids[1])
+	assert (logs[-1]["old_status"], logs[-1]["new_status"]) == ("escalated", "revoked")
+	assert logs[-1]["changed_at"] == datetime(2025, 11, 10, 10, 0)
+
+	active = {t["template_id"]: t["is_active"] for t in bulletin.get_templates()}
+	assert active == {template_ids[0]: False, template_ids[1]: False, template_ids[2]: True}
+
+
+def test_revoke_overdue_todos_of_a_user():
+	bulletin = Bulletin()
+	template_id = bulletin.add_template("U1", "Overdue", "* * * * *", "1h", "0")
+	remind_time = datetime(2025, 11, 10, 9, 0)
+	with bulletin.run_in_session() as session:
+		todo_ids = bulletin.create_todos(
+			session,
+			[
+				{
+					"template_id": template_id,
+					"user_id": user_id,
+					"ddl_offset_seconds": 3600,
+					"remind_time": remind_time + timedelta(hours=hours),
+				}
+				for user_id, hours in [("U1", 0), ("U1", 1), ("U1", 5), ("U2", 0)]
+			],
+			remind_time,
+		)
+	bulletin.complete_todo(todo_ids[1], remind_time)
+
+	assert bulletin.revoke_overdue_todos("U1", "2025-11-10T12:00:00") == 1
+	statuses = [bulletin.get_todo(todo_id)["status"] for todo_id in todo_ids]
+	assert statuses == ["revoked", "completed", "pending", "pending"]
+	assert bulletin.revoke_overdue_todos("U1", "2025-11-10T12:00:00") == 0
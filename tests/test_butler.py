@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, time
 from alfred.slack.butler import Butler
 from alfred.task.vault import get_vault
 from alfred.task.vault.models import Todo, TodoStatus
+from alfred.utils.clock import SimulatedClock, use_clock
 
 
 def test_gather_notify_blocks_with_normal_and_overdue():
@@ -58,9 +59,11 @@ def test_gather_notify_blocks_with_normal_and_overdue():
         block_text = str(blocks)
         assert "U_TEST_NOTIFY" in block_text
     
-    # verify sent_notifies updated
-    assert normal_todo_id in butler.sent_notifies["normal"]
-    assert overdue_todo_id in butler.sent_notifies["overdue"]
+    # verify the ledger was updated
+    assert butler.get_sent_notifications(now.date()) == {
+        (normal_todo_id, "normal"),
+        (overdue_todo_id, "overdue"),
+    }
     
     # second call should return empty blocks (already sent)
     with butler.gather_notify_blocks() as blocks:
@@ -136,8 +139,8 @@ def test_gather_end_of_day_summary():
         block_text = str(blocks)
         assert "U_TEST_SUMMARY" in block_text or "summary" in block_text.lower()
     
-    # verify sent_summaries updated
-    assert now.date() in butler.sent_summaries
+    # verify the summary was recorded
+    assert butler.get_last_summary_time().date() == now.date()
     
     # second call should return empty blocks (already sent)
     with butler.gather_end_of_day_summary() as blocks:
@@ -282,3 +285,75 @@ def test_build_single_todo_blocks():
     assert len(blocks) > 0
     block_text = str(blocks)
     assert "U_TEST_SINGLE" in block_text or "Single todo" in block_text
+
+
+class RecordingClient:
+    def __init__(self):
+        self.messages = []
+
+    def chat_postMessage(self, **kwargs):
+        self.messages.append(kwargs)
+        return {"ok": True}
+
+
+def test_sent_reminders_survive_a_restart():
+    """A new Butler on the same vault reads the ledger instead of posting again"""
+    butler = Butler()
+    template_id = butler.add_template(
+        user_id="U_TEST_LEDGER",
+        content="Ledger",
+        cron="0 9 * * *",
+        ddl_offset="1h",
+        run_once="0",
+    )
+    first_day = datetime(2025, 11, 10, 9, 0)
+    with get_vault().session_scope() as session:
+        todos = [
+            Todo(
+                template_id=template_id,
+                user_id="U_TEST_LEDGER",
+                remind_time=first_day + timedelta(days=day),
+                ddl_time=first_day + timedelta(days=day, hours=1),
+                status=TodoStatus.PENDING,
+            )
+            for day in range(2)
+        ]
+        session.add_all(todos)
+        session.flush()
+        todo_ids = [todo.id for todo in todos]
+
+    client = RecordingClient()
+    with use_clock(SimulatedClock(first_day + timedelta(minutes=5))) as sim_clock:
+        butler.patrol(client, "C_LEDGER")
+        assert [m["text"] for m in client.messages] == ["Todo Reminder"]
+        assert butler.get_sent_notifications(first_day.date()) == {
+            (todo_ids[0], "normal")
+        }
+        sim_clock.set(datetime(2025, 11, 10, 18, 0))
+        butler.patrol(client, "C_LEDGER")
+        # the first todo is overdue by now, then the end-of-day summary
+        assert [m["text"] for m in client.messages[1:]] == [
+            "Todo Reminder",
+            "Daily Todo Summary",
+        ]
+        assert butler.get_sent_notifications(first_day.date()) == {
+            (todo_ids[0], "normal"),
+            (todo_ids[0], "overdue"),
+        }
+        assert butler.get_last_summary_time() == sim_clock.now()
+
+        # after a deploy nothing of that day is posted again
+        client.messages.clear()
+        sim_clock.set(datetime(2025, 11, 10, 18, 5))
+        Butler().patrol(client, "C_LEDGER")
+        assert client.messages == []
+
+        # the next day's reminder is still sent, once
+        restarted = Butler()
+        sim_clock.set(first_day + timedelta(days=1, minutes=5))
+        restarted.patrol(client, "C_LEDGER")
+        restarted.patrol(client, "C_LEDGER")
+        assert [m["text"] for m in client.messages] == ["Todo Reminder"]
+        assert butler.get_sent_notifications(sim_clock.now().date()) == {
+            (todo_ids[1], "normal")
+        }
@@ -0,0 +1,121 @@
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from alfred.task import events
+from alfred.task.bulletin import Bulletin
+from alfred.task.change_feed import ChangeFeed
+
+
+@pytest.fixture
+def received():
+    """Events published while the test runs, by topic"""
+    got = {events.TEMPLATE_CHANGED: [], events.TODOS_CHANGED: []}
+    arrived = threading.Event()
+
+    def listener(topic):
+        def callback(**payload):
+            got[topic].append(payload)
+            arrived.set()
+
+        return callback
+
+    callbacks = {topic: listener(topic) for topic in got}
+    for topic, callback in callbacks.items():
+        events.subscribe(topic, callback)
+    got["arrived"] = arrived
+    yield got
+    for topic, callback in callbacks.items():
+        events.unsubscribe(topic, callback)
+
+
+def test_dispatch_republishes_notifications(received):
+    feed = ChangeFeed()
+    feed.dispatch('{"table": "todo_templates", "op": "UPDATE", "template_id": 7}')
+    feed.dispatch(
+        '{"table": "todos", "op": "INSERT", "count": 2, "todo_ids": [1, 2],'
+        ' "remind_times": ["2025-11-10T09:00:00"]}'
+    )
+
+    assert received[events.TEMPLATE_CHANGED] == [{"template_id": 7}]
+    assert received[events.TODOS_CHANGED] == [
+        {
+            "op": "INSERT",
+            "count": 2,
+            "todo_ids": [1, 2],
+            "remind_times": [datetime(2025, 11, 10, 9, 0)],
+        }
+    ]
+
+
+def _wait_for(received, topic, count, timeout=5):
+    while len(received[topic]) < count:
+        received["arrived"].clear()
+        if not received["arrived"].wait(timeout):
+            break
+    return received[topic]
+
+
+def test_writes_of_other_connections_are_delivered(received):
+    bulletin = Bulletin()
+    feed = ChangeFeed(bulletin.vault, poll_seconds=0.1)
+    if not feed.supported:
+        assert feed.start() is False
+        return
+    assert feed.start() is True
+    try:
+        assert feed.wait_listening(5)
+        # plain SQL, as another process would write, Bulletin doesn't publish it
+        with bulletin.vault.engine.begin() as conn:
+            template_id = conn.execute(
+                text(
+                    "INSERT INTO todo_templates"
+                    " (user_id, content, cron, ddl_offset, ddl_offset_seconds,"
+                    "  run_once, is_active)"
+                    " VALUES ('U_FEED', 'Feed', '0 9 * * *', '1h', 3600, false, true)"
+                    " RETURNING template_id"
+                )
+            ).scalar_one()
+        # rolled back writes are never notified
+        with pytest.raises(RuntimeError):
+            with bulletin.vault.engine.begin() as conn:
+                conn.execute(
+                    text("UPDATE todo_templates SET is_active = false"),
+                )
+                raise RuntimeError("rollback")
+        assert _wait_for(received, events.TEMPLATE_CHANGED, 1) == [
+            {"template_id": template_id}
+        ]
+
+        remind_time = datetime(2025, 11, 10, 9, 0)
+        with bulletin.run_in_session() as session:
+            todo_ids = bulletin.create_todos(
+                session,
+                [
+                    {
+                        "template_id": template_id,
+                        "user_id": f"U{i}",
+                        "ddl_offset_seconds": 3600,
+                        "remind_time": remind_time,
+                    }
+                    for i in range(3)
+                ],
+                datetime(2025, 11, 10, 8, 59),
+            )
+        # one notification for the whole burst
+        (inserted,) = _wait_for(received, events.TODOS_CHANGED, 1)
+        assert inserted == {
+            "op": "INSERT",
+            "count": 3,
+            "todo_ids": sorted(todo_ids),
+            "remind_times": [remind_time],
+        }
+
+        bulletin.complete_todo(todo_ids[0], datetime(2025, 11, 10, 9, 5))
+        updated = _wait_for(received, events.TODOS_CHANGED, 2)[1]
+        assert (updated["op"], updated["todo_ids"]) == ("UPDATE", [todo_ids[0]])
+        assert len(received[events.TEMPLATE_CHANGED]) == 1
+    finally:
+        feed.stop()
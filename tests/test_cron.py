@@ -0,0 +1,112 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from croniter import croniter
+
+from alfred.task.cron import CompiledCron, compile_cron, next_fire_time
+
+WEEKDAY_NAMES = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+
+# what the Slack modal produces for each frequency, "HH" comes from a time picker
+MODAL_CRONS = (
+    [f"{m:02d} {h:02d} * * *" for h in (0, 9, 23) for m in (0, 30, 59)]
+    + [f"{m:02d} {h:02d} * * 1-5" for h in (0, 9, 23) for m in (0, 30)]
+    + [f"{m:02d} {h:02d} * * 1" for h in (9, 18) for m in (0, 45)]
+    + [f"30 09 * * {day}#{week}" for day in WEEKDAY_NAMES for week in range(1, 6)]
+)
+
+HAND_WRITTEN_CRONS = [
+    "* * * * *",
+    "*/15 * * * *",
+    "5-50/7 */3 * * *",
+    "0 9 1,15 * *",
+    "0 9 1 * MON",
+    "0 9 1-31 * *",
+    "0 9 * * 0-6",
+    "0 9 13 * 5",
+    "0 9 * * 7",
+    "0 9 ? * MON-FRI",
+    "0 0 29 2 *",
+    "0 12 * JAN,jul *",
+    "0 0 31 */2 *",
+]
+
+# only croniter understands these
+FALLBACK_CRONS = ["0 9 L * *", "0 9 15W * *", "0 0 9 * * *", "0 9 8 * FRI#2"]
+
+
+def _random_field(rng, low, high, names=None):
+    kind = rng.choice(["*", "value", "list", "range", "step", "range_step"])
+    value = lambda: rng.randint(low, high)  # noqa: E731
+    if kind == "*":
+        return "*"
+    if kind == "value":
+        v = value()
+        return names[v] if names and rng.random() < 0.3 else str(v)
+    if kind == "list":
+        return ",".join(str(v) for v in sorted({value() for _ in range(3)}))
+    a, b = sorted((value(), value()))
+    if kind == "range":
+        return f"{a}-{b}"
+    if kind == "step":
+        return f"*/{rng.randint(1, high - low + 1)}"
+    return f"{a}-{b}/{rng.randint(1, 5)}"
+
+
+def _random_crons(count, seed=2025):
+    rng = random.Random(seed)
+    crons = []
+    while len(crons) < count:
+        dow = _random_field(rng, 0, 6, WEEKDAY_NAMES)
+        dom = _random_field(rng, 1, 31)
+        if rng.random() < 0.2:
+            dow = f"{rng.choice(WEEKDAY_NAMES)}#{rng.randint(1, 5)}"
+            dom = "*"
+        cron = " ".join(
+            [
+                _random_field(rng, 0, 59),
+                _random_field(rng, 0, 23),
+                dom,
+                _random_field(rng, 1, 12),
+                dow,
+            ]
+        )
+        if croniter.is_valid(cron):
+            crons.append(cron)
+    return crons
+
+
+def _start_times(cron, count=5):
+    rng = random.Random(cron)
+    base = datetime(2025, 1, 1)
+    return [
+        base + timedelta(minutes=rng.randrange(3 * 366 * 24 * 60), seconds=rng.randrange(60))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "cron", MODAL_CRONS + HAND_WRITTEN_CRONS + _random_crons(300)
+)
+def test_compiled_cron_matches_croniter(cron):
+    compiled = CompiledCron.compile(cron)
+    assert compiled is not None
+    for start_time in _start_times(cron):
+        expected = croniter(cron, start_time)
+        t = start_time
+        for _ in range(20):
+            t = compiled.next_after(t)
+            assert t == expected.get_next(datetime), (cron, start_time)
+            assert compiled.fires_at(t)
+            before = t - timedelta(minutes=1)
+            assert compiled.fires_at(before) == croniter.match(cron, before)
+
+
+@pytest.mark.parametrize("cron", FALLBACK_CRONS)
+def test_unsupported_syntax_falls_back_to_croniter(cron):
+    assert compile_cron(cron) is None
+    start_time = datetime(2025, 11, 7, 10, 0)
+    assert next_fire_time(cron, start_time) == croniter(cron, start_time).get_next(
+        datetime
+    )
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+import pytest
+
+from alfred.utils.duration import duration_seconds, parse_duration
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("30s", timedelta(seconds=30)),
+        ("5m", timedelta(minutes=5)),
+        ("2h", timedelta(hours=2)),
+        ("1d", timedelta(days=1)),
+        ("1", timedelta(days=1)),
+        ("1h30m", timedelta(hours=1, minutes=30)),
+        ("1d 2h", timedelta(days=1, hours=2)),
+        (" 1H30M ", timedelta(hours=1, minutes=30)),
+    ],
+)
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "h", "1x", "1h30", "-1h", "1.5h"])
+def test_parse_duration_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_duration(value)
+
+
+def test_duration_seconds():
+    assert duration_seconds("1h30m") == 5400
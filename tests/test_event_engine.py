@@ -0,0 +1,88 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from alfred.task import event_engine, events
+from alfred.task.bulletin import Bulletin
+from alfred.task.event_engine import EventEngine
+
+
+def test_step_sleeps_until_next_fire():
+    bulletin = Bulletin()
+    engine = EventEngine(resync_interval=timedelta(hours=2))
+    template_id = bulletin.add_template(
+        user_id="U_EVENT",
+        content="Hourly",
+        cron="0 * * * *",
+        ddl_offset="10m",
+        run_once="0",
+    )
+
+    # the new template is seeded, then nothing is due until a minute before 11:00
+    assert engine.step(datetime(2025, 11, 8, 10, 30)) == 29 * 60
+    assert bulletin.get_todos() == []
+
+    assert engine.step(datetime(2025, 11, 8, 10, 59)) == 60 * 60
+    todos = bulletin.get_todos()
+    assert [t["remind_time"] for t in todos] == [datetime(2025, 11, 8, 11, 0)]
+
+    # deactivation wakes the engine and drops the template from the heap
+    events.subscribe(events.TEMPLATE_CHANGED, engine.on_template_changed)
+    try:
+        bulletin.set_template_active_status(template_id, False, "2025-11-08T11:05:00")
+    finally:
+        events.unsubscribe(events.TEMPLATE_CHANGED, engine.on_template_changed)
+    assert engine._wakeup.is_set()
+    # only the periodic resync at 12:30 is left to wake up for
+    assert engine.step(datetime(2025, 11, 8, 11, 5)) == 85 * 60
+
+
+def test_new_template_is_scheduled_without_waiting_for_a_poll():
+    bulletin = Bulletin()
+    engine = EventEngine()
+    engine.start()
+    try:
+        # let the first resync find an empty table and go to sleep
+        time.sleep(0.2)
+        template_id = bulletin.add_template(
+            user_id="U_EVENT_FAST",
+            content="Every minute",
+            cron="* * * * *",
+            ddl_offset="1m",
+            run_once="0",
+        )
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not bulletin.get_todos():
+            time.sleep(0.05)
+    finally:
+        engine.stop()
+
+    todos = bulletin.get_todos()
+    assert [t["template_id"] for t in todos] == [template_id]
+
+
+def test_failed_pass_keeps_due_templates_scheduled(monkeypatch):
+    bulletin = Bulletin()
+    engine = EventEngine(resync_interval=timedelta(hours=2))
+    bulletin.add_template(
+        user_id="U_EVENT_RETRY",
+        content="Hourly",
+        cron="0 * * * *",
+        ddl_offset="10m",
+        run_once="0",
+    )
+    engine.step(datetime(2025, 11, 8, 10, 30))
+
+    def failing_scheduler(*args):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(event_engine, "run_scheduler", failing_scheduler)
+    with pytest.raises(RuntimeError):
+        engine.step(datetime(2025, 11, 8, 10, 59))
+    monkeypatch.undo()
+
+    # the retry a lookahead later still finds the template due
+    engine.step(datetime(2025, 11, 8, 11, 0))
+    todos = bulletin.get_todos()
+    assert [t["remind_time"] for t in todos] == [datetime(2025, 11, 8, 11, 0)]
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from alfred.extra.flask_app import flask_app
+from alfred.task.bulletin import Bulletin
+from alfred.utils.export import iter_export, write_export
+
+ROWS = [
+    {"todo_id": 1, "status": "pending", "remind_time": datetime(2025, 11, 10, 9, 0)},
+    {"todo_id": 2, "status": "completed", "remind_time": None},
+]
+FIELDS = ["todo_id", "status", "remind_time"]
+
+
+def test_ndjson_is_one_document_per_row():
+    buffer = io.StringIO()
+    assert write_export(iter(ROWS), buffer, "ndjson", FIELDS) == 2
+    lines = buffer.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"todo_id": 1, "status": "pending", "remind_time": "2025-11-10T09:00:00"},
+        {"todo_id": 2, "status": "completed", "remind_time": None},
+    ]
+
+
+def test_csv_has_header_even_without_rows():
+    buffer = io.StringIO()
+    assert write_export(iter(ROWS), buffer, "csv", FIELDS) == 2
+    rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+    assert rows[0] == {
+        "todo_id": "1",
+        "status": "pending",
+        "remind_time": "2025-11-10T09:00:00",
+    }
+    assert "".join(iter_export(iter([]), "csv", FIELDS)).strip() == ",".join(FIELDS)
+
+
+def test_export_is_lazy():
+    consumed = []
+
+    def rows():
+        for row in ROWS:
+            consumed.append(row["todo_id"])
+            yield row
+
+    chunks = iter_export(rows(), "ndjson", FIELDS)
+    next(chunks)
+    assert consumed == [1]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        iter_export(iter(ROWS), "xml", FIELDS)
+
+
+def test_export_route_streams_table():
+    Bulletin().add_template("U1", "Export", "0 9 * * *", "1h", "0")
+    client = flask_app.test_client()
+
+    response = client.get("/export/todo_templates")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    (template,) = [json.loads(line) for line in response.text.splitlines()]
+    assert template["content"] == "Export"
+    assert template["ddl_offset"] == "1h"
+
+    response = client.get("/export/todo_templates?format=csv")
+    assert response.mimetype == "text/csv"
+    assert response.text.splitlines()[0].startswith("template_id,user_id,content")
+
+    assert client.get("/export/engine_state").status_code == 404
+    assert client.get("/export/todos?format=xml").status_code == 400
@@ -1,5 +1,6 @@
 import pytest
 from contextlib import contextmanager
+from datetime import datetime
 
 import alfred.slack.patrol_launcher as patrol_launcher
 
@@ -159,3 +160,27 @@ def test_launch_patrol_scheduler_failure_on_start(monkeypatch):
     ok = patrol_launcher.launch_patrol_scheduler(seconds=1)
     assert ok is False
     assert shutdown_called["val"] is True
+
+
+def test_new_todos_are_patrolled_when_due(monkeypatch):
+    now = datetime(2025, 11, 10, 8, 59)
+    monkeypatch.setattr(patrol_launcher.clock, "now", lambda: now)
+    jobs = {}
+
+    class RecordingScheduler:
+        def add_job(self, func, id, replace_existing, **kwargs):
+            jobs[id] = kwargs
+
+    patrol_launcher.schedule_patrol_at(
+        RecordingScheduler(),
+        [datetime(2025, 11, 10, 8, 30), datetime(2025, 11, 10, 9, 0)],
+    )
+    # past times run right away, the others once at their time
+    assert jobs == {
+        "butler_patrol_now": {},
+        "butler_patrol_at_2025-11-10T09:00:00": {
+            "trigger": "date",
+            "run_date": datetime(2025, 11, 10, 9, 0),
+            "misfire_grace_time": 60,
+        },
+    }
@@ -0,0 +1,184 @@
+"""
+Query plans of the hot Bulletin queries on a seeded dataset.
+
+The statements a Bulletin method sends are captured and EXPLAINed on the same
+database (EXPLAIN QUERY PLAN on SQLite, EXPLAIN (FORMAT JSON) on Postgres).
+A full scan of one of the big tables fails the test.
+"""
+
+import json
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from alfred.task.bulletin import Bulletin
+from alfred.task.vault.models import Todo, TodoStatus, TodoStatusLog, TodoTemplate
+
+BIG_TABLES = {"todos", "todo_templates", "todo_status_logs"}
+
+TEMPLATES = 5_000
+# only a tenth of the templates is still active, the rest is history
+ACTIVE_EVERY = 10
+TODOS_PER_DAY = 500
+DAYS = 60
+FIRST_DAY = datetime(2025, 9, 1, 9, 0)
+NOW = FIRST_DAY + timedelta(days=DAYS - 1, hours=1)
+
+
+def _seed(vault):
+    with vault.session_scope() as session:
+        session.execute(
+            insert(TodoTemplate),
+            [
+                {
+                    "id": i + 1,
+                    "user_id": f"U{i % 300}",
+                    "content": f"Task {i}",
+                    "cron": "0 9 * * *",
+                    "ddl_offset": "1h",
+                    "ddl_offset_seconds": 3600,
+                    "run_once": False,
+                    "is_active": i % ACTIVE_EVERY == 0,
+                    # spread over the next year, only a few are due
+                    "next_fire_at": NOW + timedelta(hours=i % 8760),
+                }
+                for i in range(TEMPLATES)
+            ],
+        )
+        todos = []
+        for n in range(TODOS_PER_DAY * DAYS):
+            day, i = divmod(n, TODOS_PER_DAY)
+            remind_time = FIRST_DAY + timedelta(days=day, seconds=i)
+            todos.append(
+                {
+                    "id": n + 1,
+                    "template_id": i % TEMPLATES + 1,
+                    "user_id": f"U{i}",
+                    "remind_time": remind_time,
+                    "ddl_time": remind_time + timedelta(hours=1),
+                    # all but the last day is done
+                    "status": (
+                        TodoStatus.PENDING if day == DAYS - 1 else TodoStatus.COMPLETED
+                    ),
+                }
+            )
+        session.execute(insert(Todo), todos)
+        session.execute(
+            insert(TodoStatusLog),
+            [
+                {
+                    "todo_id": todo["id"],
+                    "old_status": None,
+                    "new_status": TodoStatus.PENDING,
+                    "changed_at": todo["remind_time"],
+                }
+                for todo in todos
+            ],
+        )
+    with vault.engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _sqlite_full_scans(conn, statement, parameters):
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    scans = []
+    for row in rows:
+        detail = row[-1]
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in BIG_TABLES and "INDEX" not in detail:
+            scans.append(detail)
+    return scans
+
+
+def _postgres_full_scans(conn, statement, parameters):
+    plan = conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + statement, parameters
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+
+    def walk(node):
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] in BIG_TABLES:
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return scans
+
+
+@pytest.fixture(scope="module")
+def seeded_vault():
+    from alfred.task.vault import get_vault
+    from alfred.task.vault.models import Base
+
+    vault = get_vault()
+    Base.metadata.drop_all(vault.engine)
+    vault.engine.dispose()
+    Base.metadata.create_all(vault.engine)
+    _seed(vault)
+    yield vault
+    Base.metadata.drop_all(vault.engine)
+
+
+@pytest.fixture(autouse=True)
+def test_vault(seeded_vault):
+    # overrides the per test fixture, seeding once per module is enough
+    yield seeded_vault
+
+
+@pytest.fixture
+def captured_selects(seeded_vault):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(seeded_vault.engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(seeded_vault.engine, "before_cursor_execute", capture)
+
+
+def _due_templates(bulletin):
+    with bulletin.run_in_session() as session:
+        bulletin.get_due_templates(session, NOW + timedelta(minutes=1))
+
+
+def _next_fire_times(bulletin):
+    with bulletin.run_in_session() as session:
+        bulletin.get_next_fire_times(session)
+
+
+HOT_QUERIES = {
+    "due templates": _due_templates,
+    "active templates": _next_fire_times,
+    "open todos by day": lambda b: b.get_todos(NOW.date(), open_only=True),
+    "todos by day": lambda b: b.get_todos(NOW.date()),
+    "todo page": lambda b: b.get_todos_page(
+        after=f"{(FIRST_DAY + timedelta(days=DAYS // 2)).isoformat()}|1"
+    ),
+    "todo page backwards": lambda b: b.get_todos_page(
+        before=f"{(FIRST_DAY + timedelta(days=DAYS // 2)).isoformat()}|1"
+    ),
+    "todo by id": lambda b: b.get_todo(TODOS_PER_DAY * DAYS // 2),
+    "logs by todo": lambda b: b.get_todo_log(TODOS_PER_DAY * DAYS // 2),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_indexes(name, seeded_vault, captured_selects):
+    HOT_QUERIES[name](Bulletin())
+    assert captured_selects, f"{name} sent no SELECT"
+
+    if seeded_vault.engine.dialect.name == "postgresql":
+        full_scans = _postgres_full_scans
+    else:
+        full_scans = _sqlite_full_scans
+    with seeded_vault.engine.connect() as conn:
+        for statement, parameters in captured_selects:
+            assert full_scans(conn, statement, parameters) == [], statement
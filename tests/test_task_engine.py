@@ -1,28 +1,10 @@
+from datetime import datetime, timedelta
+
 import pytest
 
 from alfred.task import task_engine
 from alfred.task.bulletin import Bulletin
-
-
-class DummyCron:
-    def __init__(self, sim_time):
-        # store the simulation time passed to croniter stub
-        self.sim_time = sim_time
-
-    def get_prev(self, _):
-        # return the previous minute (ceiling to minute start)
-        return self.sim_time.replace(second=0, microsecond=0)
-
-
-@pytest.fixture
-def mock_croniter(monkeypatch):
-    # monkeypatch croniter in bulletin module
-    def croniter_stub(cron_expr, current_time):
-        return DummyCron(current_time)
-
-    from alfred.task import bulletin
-    monkeypatch.setattr(bulletin, "croniter", croniter_stub)
-    return croniter_stub
+from alfred.task.vault.models import TodoTemplate
 
 
 def test_add_template_and_revoke():
@@ -56,3 +38,235 @@ def test_add_template_and_revoke():
     for todo in todos:
         if todo["template_id"] == template_id:
             assert todo["status"] == "revoked"
+
+
+def test_schedule_todos_only_fires_due_templates():
+    bulletin = Bulletin()
+    hourly_id = bulletin.add_template(
+        user_id="Dora",
+        content="Hourly",
+        cron="0 * * * *",
+        ddl_offset="10m",
+        run_once="0",
+    )
+    minutely_id = bulletin.add_template(
+        user_id="Eve",
+        content="Every minute",
+        cron="* * * * *",
+        ddl_offset="1m",
+        run_once="0",
+    )
+
+    # first pass seeds next_fire_at, only the minutely template fires within a minute
+    assert bulletin.schedule_todos("2025-11-08T10:30:30") == 1
+    # same pass again is a no-op
+    assert bulletin.schedule_todos("2025-11-08T10:30:30") == 0
+
+    with bulletin.run_in_session() as session:
+        hourly = session.get(TodoTemplate, hourly_id)
+        minutely = session.get(TodoTemplate, minutely_id)
+        assert hourly.next_fire_at == datetime(2025, 11, 8, 11, 0)
+        assert minutely.next_fire_at == datetime(2025, 11, 8, 10, 32)
+
+    # a wider window materializes every fire time inside it
+    created = bulletin.schedule_todos(
+        "2025-11-08T10:31:30", lookahead=timedelta(minutes=30)
+    )
+    assert created == 1 + 30
+
+    todos = bulletin.get_todos()
+    hourly_todos = [t for t in todos if t["template_id"] == hourly_id]
+    assert [t["remind_time"] for t in hourly_todos] == [datetime(2025, 11, 8, 11, 0)]
+    minutely_times = [t["remind_time"] for t in todos if t["template_id"] == minutely_id]
+    assert len(minutely_times) == len(set(minutely_times)) == 31
+
+
+def test_reactivated_template_skips_missed_fire_times():
+    bulletin = Bulletin()
+    template_id = bulletin.add_template(
+        user_id="Frank",
+        content="Paused",
+        cron="* * * * *",
+        ddl_offset="1m",
+        run_once="0",
+    )
+    bulletin.schedule_todos("2025-11-08T10:00:30")
+    bulletin.set_template_active_status(template_id, False, "2025-11-08T10:01:00")
+    bulletin.set_template_active_status(template_id, True, "2025-11-08T12:00:00")
+
+    assert bulletin.schedule_todos("2025-11-08T12:00:30") == 1
+    remind_times = [t["remind_time"] for t in bulletin.get_todos()]
+    assert remind_times[-1] == datetime(2025, 11, 8, 12, 1)
+
+
+def test_duplicate_todos_are_rejected_by_the_database(statement_counter):
+    bulletin = Bulletin()
+    template_ids = [
+        bulletin.add_template(
+            user_id=f"U{i}",
+            content=f"Task {i}",
+            cron="* * * * *",
+            ddl_offset="1m",
+            run_once="0",
+        )
+        for i in range(5)
+    ]
+    assert bulletin.schedule_todos("2025-11-08T10:00:30") == 5
+
+    # rewinding next_fire_at replays the same pass, e.g. a retry or a second engine
+    with bulletin.run_in_session() as session:
+        for template_id in template_ids:
+            session.get(TodoTemplate, template_id).next_fire_at = None
+    statement_counter["count"] = 0
+    assert bulletin.schedule_todos("2025-11-08T10:00:30") == 0
+    # SELECT due templates, INSERT ... ON CONFLICT DO NOTHING, UPDATE next_fire_at,
+    # upsert watermark
+    assert statement_counter["count"] == 4
+    assert len(bulletin.get_todos()) == 5
+
+    with bulletin.run_in_session() as session:
+        assert (
+            bulletin.create_todo(
+                session,
+                "U0",
+                template_ids[0],
+                60,
+                remind_time=datetime(2025, 11, 8, 10, 1),
+                create_time=datetime(2025, 11, 8, 10, 0, 30),
+            )
+            is None
+        )
+
+
+def test_backfill_after_downtime_is_bounded_by_lookback():
+    bulletin = Bulletin()
+    hourly_id = bulletin.add_template(
+        user_id="Gina",
+        content="Hourly",
+        cron="0 * * * *",
+        ddl_offset="10m",
+        run_once="0",
+    )
+    once_id = bulletin.add_template(
+        user_id="Hank",
+        content="Once",
+        cron="30 * * * *",
+        ddl_offset="10m",
+        run_once="1",
+    )
+    # nothing to catch up before the first pass ever ran
+    assert bulletin.backfill_todos("2025-11-08T08:59:30") == 0
+    bulletin.schedule_todos("2025-11-08T08:59:30")
+
+    # engine down until 14:10, only fire times of the last 3h are replayed
+    created = bulletin.backfill_todos(
+        "2025-11-08T14:10:00", max_lookback=timedelta(hours=3), chunk_size=1
+    )
+    todos = bulletin.get_todos()
+    hourly_times = [t["remind_time"] for t in todos if t["template_id"] == hourly_id]
+    once_times = [t["remind_time"] for t in todos if t["template_id"] == once_id]
+    assert hourly_times == [
+        datetime(2025, 11, 8, hour, 0) for hour in (9, 12, 13, 14)
+    ]
+    assert once_times == [datetime(2025, 11, 8, 11, 30)]
+    assert created == 4
+
+    with bulletin.run_in_session() as session:
+        assert session.get(TodoTemplate, hourly_id).next_fire_at == datetime(
+            2025, 11, 8, 15, 0
+        )
+        assert session.get(TodoTemplate, once_id).is_active is False
+
+    # the regular pass continues from there, and a retry backfills nothing
+    bulletin.schedule_todos("2025-11-08T14:10:00")
+    assert bulletin.backfill_todos("2025-11-08T14:10:00") == 0
+
+
+def test_horizon_pass_materializes_a_day_ahead():
+    bulletin = Bulletin()
+    template_id = bulletin.add_template(
+        user_id="Ivy",
+        content="Standup",
+        cron="0 9 * * 1-5",
+        ddl_offset="30m",
+        run_once="0",
+    )
+    # added at 08:30, but the next engine pass only runs at 10:00
+    with bulletin.run_in_session() as session:
+        session.get(TodoTemplate, template_id).created_at = datetime(
+            2025, 11, 7, 8, 30
+        )
+
+    # Friday 10:00, the window reaches Saturday 10:00: today's 09:00 is created late
+    # rather than skipped, the weekend has none
+    assert bulletin.schedule_todos("2025-11-07T10:00:00", timedelta(hours=24)) == 1
+    # later passes only extend the window, Monday 09:00 enters it on Sunday
+    assert bulletin.schedule_todos("2025-11-08T10:00:00", timedelta(hours=24)) == 0
+    assert bulletin.schedule_todos("2025-11-09T10:00:00", timedelta(hours=24)) == 1
+
+    assert [t["remind_time"] for t in bulletin.get_todos()] == [
+        datetime(2025, 11, 7, 9, 0),
+        datetime(2025, 11, 10, 9, 0),
+    ]
+
+
+def test_concurrent_engines_skip_claimed_templates():
+    bulletin = Bulletin()
+    if bulletin.vault.engine.dialect.name != "postgresql":
+        pytest.skip("row locks need Postgres, SQLite runs a single engine")
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    claimed_id = bulletin.add_template(
+        user_id="Jack", content="Claimed", cron="0 9 * * *", ddl_offset="1h", run_once="0"
+    )
+    free_id = bulletin.add_template(
+        user_id="Kate", content="Free", cron="0 9 * * *", ddl_offset="1h", run_once="0"
+    )
+
+    # another engine process is in the middle of scheduling `claimed_id`
+    with Session(bulletin.vault.engine) as other_engine:
+        other_engine.execute(
+            select(TodoTemplate)
+            .where(TodoTemplate.id == claimed_id)
+            .with_for_update()
+        )
+        assert bulletin.schedule_todos("2025-11-08T08:59:30") == 1
+        assert [t["template_id"] for t in bulletin.get_todos()] == [free_id]
+
+    # once released, the next pass picks it up
+    assert bulletin.schedule_todos("2025-11-08T08:59:30") == 1
+    assert sorted(t["template_id"] for t in bulletin.get_todos()) == sorted(
+        [claimed_id, free_id]
+    )
+
+
+def test_template_that_never_fires_does_not_block_the_others():
+    bulletin = Bulletin()
+    good_id = bulletin.add_template(
+        user_id="Ivy",
+        content="Every minute",
+        cron="* * * * *",
+        ddl_offset="10m",
+        run_once="0",
+    )
+    # valid syntax, but February never has a 30th
+    bad_id = bulletin.add_template(
+        user_id="Jack",
+        content="Never",
+        cron="0 0 30 2 *",
+        ddl_offset="10m",
+        run_once="0",
+    )
+
+    assert bulletin.schedule_todos("2025-11-08T08:59:30") == 1
+    assert [t["template_id"] for t in bulletin.get_todos()] == [good_id]
+
+    # the same for the backfill after downtime, e.g. after the cron was edited
+    with bulletin.run_in_session() as session:
+        session.get(TodoTemplate, bad_id).next_fire_at = datetime(2025, 11, 8, 9, 0)
+    created = bulletin.backfill_todos(
+        "2025-11-08T09:05:00", max_lookback=timedelta(hours=1), chunk_size=1
+    )
+    assert created == 5
+    assert {t["template_id"] for t in bulletin.get_todos()} == {good_id}
@@ -1,4 +1,6 @@
 import threading
+
+import pytest
 from sqlalchemy import select
 
 from alfred.task.vault.models import TodoTemplate
@@ -129,3 +131,118 @@ def test_fetch_all():
     with vault.db as session:
         all_data = session.execute(select(TodoTemplate)).scalars().all()
     assert all_data and len(all_data) == 2
+
+
+def test_read_scope_routes_to_replica(tmp_path):
+    from alfred.task.bulletin import Bulletin
+    from alfred.task.vault import Vault
+    from alfred.task.vault.models import Base
+
+    vault = Vault(
+        f"sqlite:///{tmp_path}/primary.db",
+        replica_url=f"sqlite:///{tmp_path}/replica.db",
+    )
+    # a replica that never caught up
+    Base.metadata.create_all(vault.replica_engine)
+    bulletin = Bulletin(vault)
+    bulletin.add_template("U1", "t1", "* * * * *", "5m", "0")
+
+    assert bulletin.get_templates() == []
+    with bulletin.read_your_writes():
+        assert len(bulletin.get_templates()) == 1
+    assert bulletin.get_templates() == []
+
+    vault.engine.dispose()
+    vault.replica_engine.dispose()
+
+
+def test_read_scope_falls_back_to_primary(tmp_path):
+    from alfred.task.bulletin import Bulletin
+    from alfred.task.vault import Vault
+
+    vault = Vault(
+        f"sqlite:///{tmp_path}/primary.db",
+        replica_url=f"sqlite:///{tmp_path}/missing/replica.db",
+    )
+    bulletin = Bulletin(vault)
+    bulletin.add_template("U1", "t1", "* * * * *", "5m", "0")
+    assert len(bulletin.get_templates()) == 1
+    vault.engine.dispose()
+
+
+def test_replica_sessions_are_read_only():
+    from sqlalchemy.exc import InternalError
+    from alfred.task.vault import Vault
+
+    primary = get_vault()
+    if primary.engine.dialect.name != "postgresql":
+        pytest.skip("read only transactions are a Postgres feature")
+    vault = Vault(primary.db_url, replica_url=primary.db_url)
+    with pytest.raises(InternalError):
+        with vault.read_scope() as session:
+            session.add(
+                TodoTemplate(
+                    user_id="1", content="t1", cron="* * * * *", ddl_offset="5m"
+                )
+            )
+            session.flush()
+    vault.engine.dispose()
+    vault.replica_engine.dispose()
+
+
+def test_vault_options_tune_engine(tmp_path):
+    from sqlalchemy.exc import TimeoutError
+    from alfred.task.vault import Vault
+
+    vault = Vault(
+        f"sqlite:///{tmp_path}/tuned.db",
+        options={
+            "pool_size": 2,
+            "max_overflow": 0,
+            "pool_timeout": 0.1,
+            "busy_timeout": 5000,
+            "cache_size": -4096,
+            "temp_store": "memory",
+        },
+    )
+    with vault.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -4096
+        assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+    held = [vault.engine.connect() for _ in range(2)]
+    with pytest.raises(TimeoutError):
+        vault.engine.connect()
+    stats = vault.pool_stats()["primary"]
+    assert stats["pool_size"] == 2
+    assert stats["checked_out"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 100
+    for conn in held:
+        conn.close()
+    assert vault.pool_stats()["primary"]["checked_out"] == 0
+    vault.engine.dispose()
+
+    with pytest.raises(ValueError):
+        Vault(f"sqlite:///{tmp_path}/tuned.db", options={"pool_sise": 2})
+
+
+def test_vault_options_set_postgres_timeouts():
+    from alfred.task.vault import Vault
+
+    primary = get_vault()
+    if primary.engine.dialect.name != "postgresql":
+        pytest.skip("server side timeouts are Postgres settings")
+    vault = Vault(primary.db_url, options={"statement_timeout": 1234, "lock_timeout": 500})
+    with vault.engine.connect() as conn:
+        assert conn.exec_driver_sql("SHOW statement_timeout").scalar() == "1234ms"
+        assert conn.exec_driver_sql("SHOW lock_timeout").scalar() == "500ms"
+    vault.engine.dispose()
+
+
+def test_pool_stats_route():
+    from alfred.extra.flask_app import flask_app
+
+    response = flask_app.test_client().get("/stats/pool")
+    assert response.status_code == 200
+    assert "checked_out" in response.get_json()["primary"]